@@ -4,16 +4,26 @@ from flask_restful import Api, Resource
 from flasgger import Swagger, swag_from
 from datetime import datetime
 from src.server.models.data_models import db
-from data_manager import DataManager
+from src.server.data_manager import DataManager
 from src.server.api.routes import api_bp
 import os
 from dotenv import load_dotenv
 from src.server.routes_web import web_bp
+from src.server.api.llm_adapter import get_llm_adapter
+from src.server.core import config
+from src.server.core.database import sync_schema, engine_options
+from src.server.core.metrics import init_metrics
 
 
-def create_app():
+def create_app(start_background_workers=True):
+    """
+    start_background_workers=False when the app is built before forking
+    (gunicorn preload); threads and the llama.cpp model don't survive the
+    fork, the server starts them in each worker via start_background_workers_for(app).
+    """
     app = Flask(__name__)
-    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///app.db'
+    app.config['SQLALCHEMY_DATABASE_URI'] = config.SQLALCHEMY_DATABASE_URI
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options(config.SQLALCHEMY_DATABASE_URI)
     app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
     app.config['SWAGGER'] = {
         'title': 'N-LanguagesAI API',
@@ -32,9 +42,26 @@ def create_app():
     app.register_blueprint(api_bp, url_prefix='/api')
     app.register_blueprint(web_bp, url_prefix='/ui')  # UI unter /ui
 
+    # Latenz / Queries pro Endpoint, GET /metrics
+    init_metrics(app)
+
     # Models import
     from src.server.models import data_models
     with app.app_context():
-        db.create_all()
+        sync_schema(db)
+
+    if start_background_workers:
+        start_background_workers_for(app)
+
+    return app
+
+
+def start_background_workers_for(app):
+    # soft-deleted users are removed in the background; always running,
+    # DELETE /api/users/<id>?soft=true works whatever USER_SOFT_DELETE says
+    app.manager.start_purge_worker(app, config.USER_PURGE_INTERVAL_SECONDS)
 
-    return app
\ No newline at end of file
+    # optional: Modell jetzt laden statt beim ersten Request; nach dem Fork,
+    # llama.cpps Thread-Pool (OpenMP) übersteht keinen fork()
+    if config.LLM_WARMUP:
+        get_llm_adapter().warm_up()
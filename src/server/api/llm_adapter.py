@@ -1,75 +1,486 @@
 import os
 from dotenv import load_dotenv
+import importlib.util
 import json
+import queue
+import re
+import threading
+import time
+
+from src.server.api.score_cache import get_score_cache
+from src.server.api.prescorer import get_prescorer
+from src.server.api.prompt_cache import PrefixStateCache
+from src.server.core import config
+from src.server.core.metrics import LLM_REQUEST_SECONDS, LLM_SCORE_SECONDS, LLM_TOKENS, QUEUE_DEPTH
 
 load_dotenv()  # Lädt .env Datei
 
 LLM_PROVIDER = os.getenv("LLM_PROVIDER", "openai")
+MODEL_PATH = os.getenv("MODEL_PATH", "./models/llama-2-7b.Q4_K_M.gguf")
+
+# max. Anzahl Einträge, die in einen einzigen Batch-Prompt gepackt werden
+BATCH_MAX_ITEMS = int(os.getenv("LLM_BATCH_MAX_ITEMS", "20"))
+
+# Feste Anweisung steht vorne, damit ihr KV-State wiederverwendet werden kann
+SCORE_PREFIX = "Compare the user translations with the sentence to translate. Return only a number between 0 and 100.\n"
+BATCH_SCORE_PREFIX = (
+    "Compare the user translations of each numbered item with its sentence to translate. "
+    "Return only a JSON array with one number between 0 and 100 per item, in the same order.\n"
+)
+
+# Fortsetzung des Scoring-Prompts für das Streaming-Feedback
+FEEDBACK_INSTRUCTION = (
+    "In one or two short sentences, tell the learner what was wrong or missing "
+    "(e.g. only the accent marks). Do not repeat the score.\n"
+)
+
+# GBNF für llama.cpp: das Modell kann nur eine ganze Zahl von 0 bis 100 erzeugen
+SCORE_GRAMMAR = '''root ::= score
+score ::= "100" | [1-9] [0-9] | [0-9]'''
+
+# Structured Output für OpenAI
+SCORE_SCHEMA = {
+    "name": "score",
+    "strict": True,
+    "schema": {
+        "type": "object",
+        "properties": {"score": {"type": "integer", "minimum": 0, "maximum": 100}},
+        "required": ["score"],
+        "additionalProperties": False
+    }
+}
+SCORE_LIST_SCHEMA = {
+    "name": "scores",
+    "strict": True,
+    "schema": {
+        "type": "object",
+        "properties": {
+            "scores": {"type": "array", "items": {"type": "integer", "minimum": 0, "maximum": 100}}
+        },
+        "required": ["scores"],
+        "additionalProperties": False
+    }
+}
+
+
+def _score_list_grammar(count: int) -> str:
+    # "[s,s,...,s]" mit genau count Zahlen
+    return 'root ::= "[" score' + ' "," score' * (count - 1) + ' "]"\n' + SCORE_GRAMMAR.split("\n")[1]
+
+
+class ScoreParseError(ValueError):
+    pass
+
 
 class LLMAdapter:
-    def __init__(self):
-        if LLM_PROVIDER == "openai":
-            from openai import OpenAI
-            self.client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+    def __init__(self, provider=None):
+        # nur Konfiguration; der Client wird erst beim ersten Aufruf geladen
+        provider = provider or LLM_PROVIDER
+        if provider == "openai":
             self.provider = "openai"
+            self.model = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
 
-        elif LLM_PROVIDER == "local":
-            try:
-                from llama_cpp import Llama
-                model_path = os.getenv("MODEL_PATH", "./models/llama-2-7b.Q4_K_M.gguf")
-                self.client = Llama(model_path=model_path)
+        elif provider == "local":
+            if importlib.util.find_spec("llama_cpp") is not None:
                 self.provider = "local"
-            except ImportError:
+                self.model = os.path.basename(MODEL_PATH)
+            else:
                 print("Warning: llama-cpp-python not installed. Using mock local provider.")
-                self.client = None
                 self.provider = "mock"
+                self.model = "mock"
 
         else:
-            raise ValueError(f"Unsupported LLM provider: {LLM_PROVIDER}")
+            raise ValueError(f"Unsupported LLM provider: {provider}")
+
+        self._client = None
+        self._client_lock = threading.Lock()
+        # ein In-Process-Llama ist nicht thread-safe
+        self._local_lock = threading.Lock()
+        self.prefix_cache = PrefixStateCache(config.LLM_PREFIX_CACHE_STATES, config.LLM_PREFIX_CACHE_MAX_MB * 1024 * 1024)
+        self.cache = get_score_cache()
+        self.prescorer = get_prescorer()
+
+    @property
+    def client(self):
+        if self._client is None and self.provider != "mock":
+            with self._client_lock:
+                if self._client is None:
+                    self._client = self._load_client()
+        return self._client
+
+    def _load_client(self):
+        if self.provider == "openai":
+            from openai import OpenAI
+            return OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+
+        if config.LLM_LOCAL_WORKERS > 0:
+            from src.server.api.local_pool import LocalInferencePool
+            pool = LocalInferencePool(
+                model_path=MODEL_PATH,
+                workers=config.LLM_LOCAL_WORKERS,
+                n_ctx=config.LLM_N_CTX,
+                use_mmap=config.LLM_USE_MMAP,
+                use_mlock=config.LLM_USE_MLOCK,
+                queue_size=config.LLM_LOCAL_QUEUE_SIZE,
+                timeout=config.LLM_LOCAL_TIMEOUT_SECONDS,
+                prefix_cache_states=config.LLM_PREFIX_CACHE_STATES,
+                prefix_cache_bytes=config.LLM_PREFIX_CACHE_MAX_MB * 1024 * 1024
+            )
+            QUEUE_DEPTH.set_function(pool.depth, queue="llm_local_pool")
+            return pool
 
-    def score_answer(self, to_translate: str, translations: dict) -> int:
-        normalized_translations = {
+        from llama_cpp import Llama
+        return Llama(
+            model_path=MODEL_PATH,
+            n_ctx=config.LLM_N_CTX,
+            use_mmap=config.LLM_USE_MMAP,
+            use_mlock=config.LLM_USE_MLOCK,
+            verbose=False
+        )
+
+    def warm_up(self):
+        """
+        Lädt den Client und erzeugt einen Token, damit die erste echte
+        Anfrage nicht die Ladezeit des Modells bezahlt.
+        """
+        if self.provider == "local":
+            self._complete("Ready?", max_tokens=1, kind="warmup")
+        else:
+            self.client
+
+    @staticmethod
+    def normalize_translations(translations: dict) -> dict:
+        # {"translations": [{"it": "..."}, {"en": "..."}]} -> {"it": "...", "en": "..."}
+        entries = translations["translations"]
+        if isinstance(entries, dict):
+            return dict(entries)
+        return {
             language_code : translation
-            for translation_dict in translations["translations"]
+            for translation_dict in entries
             for language_code, translation in translation_dict.items()
         }
-        
-        
 
-        user_translations = json.dumps(normalized_translations)
+    def _complete(self, prompt: str, max_tokens: int, grammar=None, json_schema=None, prefixes=None, kind="completion") -> str:
+        """
+        grammar: GBNF für llama.cpp, json_schema: Structured-Output-Schema für OpenAI,
+        prefixes: feste Prompt-Anfänge, deren KV-State lokal wiederverwendet wird,
+        kind: Label für die Metriken (score, batch, translate, ...)
+        """
+        with LLM_REQUEST_SECONDS.time(provider=self.provider, kind=kind):
+            return self._complete_raw(prompt, max_tokens, grammar, json_schema, prefixes)
+
+    def _observe_tokens(self, usage):
+        if not usage:
+            return
+        LLM_TOKENS.observe(usage["prompt_tokens"], provider=self.provider, type="prompt")
+        LLM_TOKENS.observe(usage["completion_tokens"], provider=self.provider, type="completion")
+
+    def _complete_raw(self, prompt, max_tokens, grammar, json_schema, prefixes) -> str:
+        if self.provider == "openai":
+            extra = {}
+            if json_schema:
+                extra["response_format"] = {"type": "json_schema", "json_schema": json_schema}
+            response = self.client.chat.completions.create(
+                model=self.model,
+                messages=[{"role": "user", "content": prompt}],
+                max_tokens=max_tokens,
+                temperature=0,
+                **extra
+            )
+            if response.usage:
+                self._observe_tokens(response.usage.model_dump())
+            return response.choices[0].message.content.strip()
+
+        elif self.provider == "local":
+            extra = {}
+            if grammar:
+                extra["grammar"] = grammar
+            if prefixes and config.LLM_PREFIX_CACHE_ENABLED:
+                extra["prefixes"] = prefixes
+            output = self._local_call(prompt, max_tokens=max_tokens, temperature=0, stop=["\n"], **extra)
+            self._observe_tokens(output.get("usage"))
+            return output["choices"][0]["text"].strip()
+
+        # Mock scoring for development
+        return "0.8"
+
+    def _local_call(self, prompt: str, **kwargs):
+        client = self.client
+        if config.LLM_LOCAL_WORKERS > 0:
+            # der Pool verteilt selbst auf seine Worker-Prozesse
+            return client(prompt, **kwargs)
+        if isinstance(kwargs.get("grammar"), str):
+            from src.server.api.local_pool import compile_grammar
+            kwargs["grammar"] = compile_grammar(kwargs["grammar"])
+        prefixes = kwargs.pop("prefixes", None)
+        with self._local_lock:
+            if prefixes:
+                self.prefix_cache.prepare(client, prefixes)
+            return client(prompt, **kwargs)
+
+    @staticmethod
+    def _parse_score(raw) -> int:
+        if isinstance(raw, (int, float)):
+            return max(0, min(100, int(raw)))
+        try:
+            value = json.loads(raw)
+            if isinstance(value, dict):
+                value = value["score"]
+            return max(0, min(100, int(value)))
+        except (ValueError, TypeError, KeyError):
+            pass
+        # Fallback für unbeschränkte Ausgaben ("Score: 85")
+        match = re.search(r"\d+(?:\.\d+)?", str(raw))
+        if not match:
+            raise ScoreParseError(f"Could not parse score from LLM output: {raw!r}")
+        return max(0, min(100, int(float(match.group(0)))))
+
+    def translate(self, text: str, source_language: str, target_language: str) -> str:
+        """
+        Übersetzt einen Satz; Ergebnis wird als Referenzübersetzung gespeichert.
+        """
+        prompt = (
+            f"Translate the following sentence from {source_language} to {target_language}. "
+            f"Return only the translation.\n"
+            f"Sentence: {text}\nTranslation: "
+        )
+        if self.provider == "mock":
+            return f"[{target_language}] {text}"
+        raw = self._complete(prompt, max_tokens=128, kind="translate")
+        return raw.strip().strip('"')
+
+    def score_answer(self, to_translate: str, translations: dict, references: dict = None) -> int:
         """
         Gibt Score zwischen 0 (sehr falsch) und 100 (perfekt) zurück
+        references: optionale Referenzübersetzungen {language_code: text} für den Pre-Scorer
+        """
+        start = time.perf_counter()
+        normalized_translations = self.normalize_translations(translations)
+        prescore = self.prescorer.score(to_translate, normalized_translations, references)
+        if prescore is not None:
+            LLM_SCORE_SECONDS.observe(time.perf_counter() - start, provider=self.provider, source="prescorer")
+            return prescore
+
+        cache_key = self._cache_key(to_translate, normalized_translations)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            LLM_SCORE_SECONDS.observe(time.perf_counter() - start, provider=self.provider, source="cache")
+            return cached
+
+        # Anweisung -> Ausgangssatz -> Antworten: nur der letzte Teil ändert sich pro Aufruf
+        prefixes = self._scoring_prefixes(to_translate)
+        prompt = self._scoring_prompt(prefixes, normalized_translations)
+
+        # Grammatik/Schema erzwingen eine Zahl; 4 Tokens reichen für "100" bzw. {"score":100}
+        raw = self._complete(
+            prompt,
+            max_tokens=4 if self.provider == "local" else 12,
+            grammar=SCORE_GRAMMAR,
+            json_schema=SCORE_SCHEMA,
+            prefixes=prefixes,
+            kind="score"
+        )
+        score = self._parse_score(raw)
+        self.cache.set(cache_key, score)
+        LLM_SCORE_SECONDS.observe(time.perf_counter() - start, provider=self.provider, source="llm")
+        return score
+
+    @staticmethod
+    def _scoring_prompt(prefixes: list, normalized_translations: dict) -> str:
+        user_translations = json.dumps(normalized_translations, ensure_ascii=False)
+        return prefixes[-1] + f'User Translations: {user_translations}\nScore: '
+
+    def evaluate_stream(self, to_translate: str, translations: dict, references: dict = None):
         """
-        prompt = f"""
-        Compare these translations:
-        to translate: "{to_translate}"
-        User Translations: "{user_translations}"
-        Return only a number between 0 and 100.
+        Generator für die Streaming-Bewertung: liefert zuerst ("score", int),
+        sobald der Score feststeht, danach ("feedback", text) Stück für Stück.
+        Der Feedback-Prompt setzt den Scoring-Prompt fort, sodass dessen
+        KV-State (lokal) weiterverwendet wird.
         """
+        score = self.score_answer(to_translate, translations, references)
+        yield "score", score
+
+        normalized_translations = self.normalize_translations(translations)
+        prompt = self._scoring_prompt(self._scoring_prefixes(to_translate), normalized_translations)
+        with LLM_REQUEST_SECONDS.time(provider=self.provider, kind="feedback_stream"):
+            for text in self._stream_feedback(prompt + f"{score}\n", score):
+                if text:
+                    yield "feedback", text
 
+    def _stream_feedback(self, prompt: str, score: int):
+        max_tokens = config.LLM_FEEDBACK_MAX_TOKENS
         if self.provider == "openai":
-            response = self.client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[{"role": "user", "content": prompt}]
+            stream = self.client.chat.completions.create(
+                model=self.model,
+                messages=[{"role": "user", "content": prompt + FEEDBACK_INSTRUCTION}],
+                max_tokens=max_tokens,
+                temperature=0,
+                stream=True
             )
-            raw = response.choices[0].message.content.strip()
+            for chunk in stream:
+                if chunk.choices:
+                    yield chunk.choices[0].delta.content
 
         elif self.provider == "local":
-            output = self.client(prompt, max_tokens=10)
-            raw = output["choices"][0]["text"].strip()
-        
-        elif self.provider == "mock":
-            # Mock scoring for development
-            raw = "0.8"
+            prompt += FEEDBACK_INSTRUCTION + "Feedback: "
+            if config.LLM_LOCAL_WORKERS > 0:
+                # Generatoren lassen sich nicht aus dem Worker-Prozess streamen: am Stück
+                output = self._local_call(prompt, max_tokens=max_tokens, temperature=0, stop=["\n\n"])
+                yield output["choices"][0]["text"].strip()
+                return
+            yield from self._local_stream(prompt, max_tokens=max_tokens, temperature=0, stop=["\n\n"])
+
+        else:
+            # Mock feedback for development
+            for word in f"Mock feedback for a score of {score}.".split(" "):
+                yield word + " "
+
+    def _local_stream(self, prompt: str, **kwargs):
+        # llama.cpp erzeugt in einem eigenen Thread und reicht jeden Token über
+        # eine Queue weiter: der Modell-Lock hängt nicht an einem langsamen Client
+        tokens = queue.Queue()
+        done = object()
+
+        def produce():
+            try:
+                with self._local_lock:
+                    for chunk in self.client(prompt, stream=True, **kwargs):
+                        tokens.put(chunk["choices"][0]["text"])
+            except Exception as e:
+                tokens.put(e)
+            finally:
+                tokens.put(done)
+
+        threading.Thread(target=produce, name="llm-stream", daemon=True).start()
+        while True:
+            token = tokens.get()
+            if token is done:
+                return
+            if isinstance(token, Exception):
+                raise token
+            yield token
+
+    def warm_scoring_prefix(self, to_translate: str) -> bool:
+        """
+        Wertet die Scoring-Prefixe für einen kommenden Satz schon vorab aus,
+        damit beim Bewerten nur noch die Antwort-Tokens übrig bleiben.
+        Nur für das Modell im Webprozess; die Worker des LocalInferencePool
+        haben jeweils eigene States, die sich nicht gezielt füllen lassen.
+        """
+        if self.provider != "local" or not config.LLM_PREFIX_CACHE_ENABLED or config.LLM_LOCAL_WORKERS > 0:
+            return False
+        prefixes = self._scoring_prefixes(to_translate)
+        client = self.client
+        with self._local_lock:
+            if prefixes[-1] in self.prefix_cache:
+                return False
+            self.prefix_cache.prepare(client, prefixes)
+        return True
+
+    @staticmethod
+    def _scoring_prefixes(to_translate: str) -> list:
+        return [SCORE_PREFIX, SCORE_PREFIX + f'To translate: "{to_translate}"\n']
+
+    def _cache_key(self, to_translate: str, normalized_translations: dict) -> str:
+        return self.cache.make_key(to_translate, normalized_translations, self.provider, self.model)
+
+    def score_answers_batch(self, items: list) -> list:
+        """
+        Bewertet mehrere (to_translate, translations)-Paare mit einem LLM-Aufruf
+        pro Chunk statt einem Aufruf pro Antwort.
+        items: [{"to_translate": str, "translations": dict, "references": dict (optional)}, ...]
+        Gibt eine Liste von Scores (0-100) in der Reihenfolge von items zurück.
+        """
+        scores = [None] * len(items)
+        pending = {}  # key -> (item, [indices]), doppelte Einträge nur einmal bewerten
+        for index, item in enumerate(items):
+            normalized_translations = self.normalize_translations(item["translations"])
+            prescore = self.prescorer.score(item["to_translate"], normalized_translations, item.get("references"))
+            if prescore is not None:
+                scores[index] = prescore
+                continue
+
+            key = self._cache_key(item["to_translate"], normalized_translations)
+            if key in pending:
+                pending[key][1].append(index)
+                continue
+            cached = self.cache.get(key)
+            if cached is not None:
+                scores[index] = cached
+            else:
+                pending[key] = (item, [index])
+
+        # nur Cache-Misses gehen ans LLM
+        pending = list(pending.items())
+        for start in range(0, len(pending), BATCH_MAX_ITEMS):
+            chunk = pending[start:start + BATCH_MAX_ITEMS]
+            chunk_scores = self._score_chunk([item for _, (item, _) in chunk])
+            for (key, (_, indices)), score in zip(chunk, chunk_scores):
+                self.cache.set(key, score)
+                for index in indices:
+                    scores[index] = score
+        return scores
 
+    def _score_chunk(self, chunk: list) -> list:
+        if not chunk:
+            return []
+
+        lines = []
+        for number, item in enumerate(chunk, start=1):
+            user_translations = json.dumps(self.normalize_translations(item["translations"]), ensure_ascii=False)
+            lines.append(
+                f'{number}. To translate: "{item["to_translate"]}" '
+                f'User Translations: {user_translations}'
+            )
+        entries = "\n".join(lines)
+        prompt = BATCH_SCORE_PREFIX + entries + f"\nScores ({len(chunk)} items): "
+
+        if self.provider == "mock":
+            raw = json.dumps(["0.8"] * len(chunk))
+        else:
+            # max. 3 Ziffern + Komma pro Zahl, plus Klammern
+            raw = self._complete(
+                prompt,
+                max_tokens=4 * len(chunk) + 4,
+                grammar=_score_list_grammar(len(chunk)),
+                json_schema=SCORE_LIST_SCHEMA,
+                prefixes=[BATCH_SCORE_PREFIX],
+                kind="batch"
+            )
+
+        parsed = self._parse_score_list(raw, len(chunk))
+        if parsed is None:
+            # Antwort unbrauchbar -> einzeln bewerten statt alles auf 0 zu setzen
+            return [self.score_answer(item["to_translate"], item["translations"], item.get("references")) for item in chunk]
+        return parsed
+
+    def _parse_score_list(self, raw: str, expected: int):
+        match = re.search(r"\[.*?\]", raw, re.DOTALL)
+        if not match:
+            return None
         try:
-            score = int(raw)
-            return max(0, min(100, score))
-        except:
-            return 0.0
+            values = json.loads(match.group(0))
+        except ValueError:
+            return None
+        if not isinstance(values, list) or len(values) != expected:
+            return None
+        try:
+            return [self._parse_score(value) for value in values]
+        except ScoreParseError:
+            return None
+
+
+
+_adapters = {}
+_adapters_lock = threading.Lock()
 
 
-# TODO Test entfernen
-ladapter = LLMAdapter()
-trans = {"translations": [{"it": "vado al lavoro"}, {"en": "fuck"}]}
-print(ladapter.score_answer("ich fahre zur Arbeit", trans))
+def get_llm_adapter(provider=None) -> LLMAdapter:
+    """
+    Prozessweite Registry: ein Adapter (und damit ein geladenes Modell) pro Provider.
+    """
+    provider = provider or LLM_PROVIDER
+    with _adapters_lock:
+        if provider not in _adapters:
+            _adapters[provider] = LLMAdapter(provider)
+        return _adapters[provider]
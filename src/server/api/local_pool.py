@@ -0,0 +1,86 @@
+import functools
+import multiprocessing
+import os
+import threading
+
+from src.server.api.prompt_cache import PrefixStateCache
+
+
+# Modell und Prefix-Cache des jeweiligen Worker-Prozesses (werden in _init_worker geladen)
+_worker_llm = None
+_worker_prefix_cache = None
+
+
+def _init_worker(model_path, n_ctx, use_mmap, use_mlock, n_threads, prefix_cache_states, prefix_cache_bytes):
+    global _worker_llm, _worker_prefix_cache
+    _worker_prefix_cache = PrefixStateCache(prefix_cache_states, prefix_cache_bytes)
+    from llama_cpp import Llama
+    # mmap: alle Worker teilen sich die Modellseiten über den Page-Cache
+    _worker_llm = Llama(
+        model_path=model_path,
+        n_ctx=n_ctx,
+        use_mmap=use_mmap,
+        use_mlock=use_mlock,
+        n_threads=n_threads,
+        verbose=False
+    )
+
+
+@functools.lru_cache(maxsize=32)
+def compile_grammar(grammar_text):
+    # LlamaGrammar ist nicht picklebar -> als GBNF-Text übergeben und pro Prozess kompilieren
+    from llama_cpp import LlamaGrammar
+    return LlamaGrammar.from_string(grammar_text, verbose=False)
+
+
+def _run_completion(prompt, kwargs):
+    if isinstance(kwargs.get("grammar"), str):
+        kwargs["grammar"] = compile_grammar(kwargs["grammar"])
+    prefixes = kwargs.pop("prefixes", None)
+    if prefixes:
+        _worker_prefix_cache.prepare(_worker_llm, prefixes)
+    return _worker_llm(prompt, **kwargs)
+
+
+class LocalInferencePool:
+    """
+    Pool von llama.cpp-Prozessen, jeder mit eigenem (gemappten) Modell.
+    Aufrufbar wie ein Llama-Objekt: pool(prompt, max_tokens=...) -> completion dict.
+    """
+
+    def __init__(self, model_path, workers, n_ctx, use_mmap, use_mlock, queue_size, timeout, prefix_cache_states,
+                 prefix_cache_bytes=None):
+        self.workers = workers
+        self.timeout = timeout
+        n_threads = max(1, (os.cpu_count() or 1) // workers)
+        # spawn statt fork: der Webprozess hat bereits Threads (Scoring-Queue etc.)
+        context = multiprocessing.get_context("spawn")
+        self._pool = context.Pool(
+            processes=workers,
+            initializer=_init_worker,
+            initargs=(model_path, n_ctx, use_mmap, use_mlock, n_threads, prefix_cache_states, prefix_cache_bytes)
+        )
+        self._slots = threading.BoundedSemaphore(queue_size)
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, prompt, **kwargs):
+        if not self._slots.acquire(timeout=self.timeout):
+            raise TimeoutError("Local inference queue is full")
+        with self._lock:
+            self._pending += 1
+        try:
+            result = self._pool.apply_async(_run_completion, (prompt, kwargs))
+            return result.get(self.timeout)
+        finally:
+            with self._lock:
+                self._pending -= 1
+            self._slots.release()
+
+    def depth(self) -> int:
+        with self._lock:
+            return self._pending
+
+    def close(self):
+        self._pool.close()
+        self._pool.join()
@@ -0,0 +1,72 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from src.server.api.translation_pipeline import get_translation_pipeline
+from src.server.core import config
+from src.server.core.metrics import QUEUE_DEPTH
+
+
+class ReviewPrefetcher:
+    """
+    Nutzt die Zeit, in der der Lernende tippt: für die nächsten Karten der
+    Review-Queue werden fehlende Referenzübersetzungen erzeugt und der
+    KV-State der Scoring-Prefixe des lokalen Modells vorgewärmt. Beim
+    Absenden bleibt dann nur der eigentliche Scoring-Schritt übrig.
+    """
+
+    def __init__(self, depth, max_workers=1):
+        self.depth = depth
+        # ein Worker reicht: das lokale Modell rechnet ohnehin nur einen Aufruf gleichzeitig
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="prefetch")
+        self._lock = threading.Lock()
+        self._pending = set()
+
+        self.translated = 0
+        self.warmed = 0
+
+    def schedule(self, app, llm, review_queue, user_id):
+        for card in review_queue.upcoming(user_id, self.depth):
+            with self._lock:
+                if card.id in self._pending:
+                    continue
+                self._pending.add(card.id)
+            self._executor.submit(self._run, app, llm, review_queue, card)
+
+    def _run(self, app, llm, review_queue, card):
+        try:
+            # zuerst die Referenzen: damit entscheidet oft schon der Pre-Scorer ohne LLM
+            if set(card.target_languages) - card.translations.keys():
+                with app.app_context():
+                    # Lock der Pipeline: läuft dort noch ein Job für den Satz, kommt die
+                    # Übersetzung danach aus dem Cache statt aus einem zweiten LLM-Aufruf
+                    translations = app.manager.translate_sentence(
+                        card.id, key_lock=get_translation_pipeline().key_lock
+                    )
+                review_queue.update_card(card.user_id, card.id, translations=translations)
+                with self._lock:
+                    self.translated += 1
+            if llm.warm_scoring_prefix(card.original_text):
+                with self._lock:
+                    self.warmed += 1
+        except Exception as e:
+            print(f"Warning: prefetching sentence {card.id} failed: {e}")
+        finally:
+            with self._lock:
+                self._pending.discard(card.id)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {'pending': len(self._pending), 'translated': self.translated, 'warmed': self.warmed}
+
+
+_prefetcher = None
+_prefetcher_lock = threading.Lock()
+
+
+def get_prefetcher() -> ReviewPrefetcher:
+    global _prefetcher
+    with _prefetcher_lock:
+        if _prefetcher is None:
+            _prefetcher = ReviewPrefetcher(config.PREFETCH_DEPTH)
+            QUEUE_DEPTH.set_function(lambda: _prefetcher.stats()['pending'], queue="review_prefetch")
+        return _prefetcher
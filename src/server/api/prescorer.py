@@ -0,0 +1,144 @@
+import string
+import threading
+import unicodedata
+
+from src.server.core import config
+
+
+# Buchstaben ohne Unicode-Zerlegung in Basis + Akzent
+_FOLD_MAP = str.maketrans({
+    "đ": "d", "Đ": "D", "ø": "o", "Ø": "O", "ł": "l", "Ł": "L",
+    "ß": "ss", "æ": "ae", "Æ": "AE", "œ": "oe", "Œ": "OE",
+})
+_PUNCTUATION = str.maketrans("", "", string.punctuation + "¿¡«»„“”‚‘’…–—")
+
+
+def _normalize(text: str) -> str:
+    # Groß-/Kleinschreibung, Satzzeichen und Leerzeichen ignorieren
+    text = unicodedata.normalize("NFC", text).casefold().translate(_PUNCTUATION)
+    return " ".join(text.split())
+
+
+def _strip_diacritics(text: str) -> str:
+    decomposed = unicodedata.normalize("NFD", text.translate(_FOLD_MAP))
+    return "".join(c for c in decomposed if not unicodedata.combining(c))
+
+
+def _edit_similarity(a: str, b: str) -> float:
+    if not a and not b:
+        return 1.0
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, start=1):
+        current = [i]
+        for j, char_b in enumerate(b, start=1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (char_a != char_b)
+            ))
+        previous = current
+    return 1.0 - previous[-1] / max(len(a), len(b))
+
+
+def _trigram_similarity(a: str, b: str) -> float:
+    grams_a = {a[i:i + 3] for i in range(len(a) - 2)} or {a}
+    grams_b = {b[i:i + 3] for i in range(len(b) - 2)} or {b}
+    return 2 * len(grams_a & grams_b) / (len(grams_a) + len(grams_b))
+
+
+def _token_similarity(a: str, b: str) -> float:
+    tokens_a, tokens_b = set(a.split()), set(b.split())
+    if not tokens_a or not tokens_b:
+        return 0.0
+    return len(tokens_a & tokens_b) / len(tokens_a | tokens_b)
+
+
+class PreScorer:
+    """
+    Deterministische Vorstufe vor dem LLM: entscheidet eindeutig richtige
+    (und leere) Antworten lokal, alles andere gibt None zurück.
+    """
+
+    def __init__(self, accept_threshold, reject_threshold, diacritics_score, enabled=True):
+        self.accept_threshold = accept_threshold
+        self.reject_threshold = reject_threshold
+        self.diacritics_score = diacritics_score
+        self.enabled = enabled
+        self._lock = threading.Lock()
+
+        self.decided = 0
+        self.deferred = 0
+
+    def similarity(self, answer: str, reference: str) -> float:
+        a, b = _strip_diacritics(answer), _strip_diacritics(reference)
+        return max(_edit_similarity(a, b), (_trigram_similarity(a, b) + _token_similarity(a, b)) / 2)
+
+    def score_language(self, to_translate: str, answer, reference=None):
+        answer = _normalize(answer or "")
+        if not answer:
+            return 0
+        # ohne Referenz kein lokales Urteil: auch "Hotel" -> "Hotel" kann richtig sein
+        if reference is None:
+            return None
+
+        reference = _normalize(reference)
+        if answer == reference:
+            return 100
+        if _strip_diacritics(answer) == _strip_diacritics(reference):
+            return self.diacritics_score
+        # Ausgangssatz einfach abgeschrieben
+        if answer == _normalize(to_translate):
+            return 0
+
+        similarity = self.similarity(answer, reference)
+        # geringe Ähnlichkeit zu einer Referenz heißt nicht falsch (Synonyme),
+        # daher lehnt nur ein explizit gesetzter reject_threshold lokal ab
+        if similarity >= self.accept_threshold or similarity < self.reject_threshold:
+            return round(similarity * 100)
+        return None
+
+    def score(self, to_translate: str, translations: dict, references=None):
+        """
+        translations: {language_code: user_answer}, references: {language_code: reference}
+        Gibt einen Score (0-100) zurück, oder None wenn das LLM entscheiden muss.
+        """
+        if not self.enabled or not translations:
+            return None
+
+        references = references or {}
+        scores = []
+        for language_code, answer in translations.items():
+            score = self.score_language(to_translate, answer, references.get(language_code))
+            if score is None:
+                with self._lock:
+                    self.deferred += 1
+                return None
+            scores.append(score)
+
+        with self._lock:
+            self.decided += 1
+        return round(sum(scores) / len(scores))
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.decided + self.deferred
+            return {
+                'enabled': self.enabled,
+                'decided': self.decided,
+                'deferred_to_llm': self.deferred,
+                'decision_rate': self.decided / total if total else 0.0,
+                'accept_threshold': self.accept_threshold,
+                'reject_threshold': self.reject_threshold,
+            }
+
+
+_prescorer = PreScorer(
+    accept_threshold=config.PRESCORE_ACCEPT_THRESHOLD,
+    reject_threshold=config.PRESCORE_REJECT_THRESHOLD,
+    diacritics_score=config.PRESCORE_DIACRITICS_SCORE,
+    enabled=config.PRESCORE_ENABLED,
+)
+
+
+def get_prescorer() -> PreScorer:
+    return _prescorer
@@ -0,0 +1,79 @@
+from collections import OrderedDict
+
+
+def _state_bytes(state) -> int:
+    # KV-Zellen (llama_state_size) plus Logits- und Token-Puffer von llama-cpp-python
+    size = getattr(state, "llama_state_size", 0)
+    for buffer in (getattr(state, "scores", None), getattr(state, "input_ids", None)):
+        size += getattr(buffer, "nbytes", 0)
+    return size
+
+
+class PrefixStateCache:
+    """
+    Hält llama.cpp-KV-States für feste Prompt-Prefixe. Vor einem Aufruf wird
+    der längste bekannte Prefix geladen; llama-cpp-python wertet danach nur
+    noch die Tokens aus, die nicht mit dem geladenen State übereinstimmen.
+
+    Begrenzt nach Anzahl und Bytes, da ein State schnell zig MB groß ist und
+    jeder Prozess (Webprozess, jeder Pool-Worker) seinen eigenen Cache hat.
+
+    Nicht thread-safe: wird nur unter dem Lock des Adapters bzw. im
+    (einzelnen) Thread eines Worker-Prozesses benutzt.
+    """
+
+    def __init__(self, max_states, max_bytes=None):
+        self.max_states = max_states
+        self.max_bytes = max_bytes
+        self._states = OrderedDict()  # prefix -> (state, bytes)
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def prepare(self, llm, prefixes):
+        """
+        prefixes: aufsteigend verschachtelte Prefixe des nächsten Prompts,
+        z.B. [Anweisung, Anweisung + Ausgangssatz].
+        """
+        start = 0
+        for depth in range(len(prefixes) - 1, -1, -1):
+            entry = self._states.get(prefixes[depth])
+            if entry is not None:
+                llm.load_state(entry[0])
+                self._states.move_to_end(prefixes[depth])
+                self.hits += 1
+                start = depth + 1
+                break
+        else:
+            llm.reset()
+
+        # fehlende Stufen einmal auswerten und für die nächsten Aufrufe speichern
+        for prefix in prefixes[start:]:
+            self.misses += 1
+            tokens = llm.tokenize(prefix.encode("utf-8"), special=True)
+            evaluated = list(llm._input_ids)
+            common = 0
+            while common < min(len(tokens), len(evaluated)) and tokens[common] == evaluated[common]:
+                common += 1
+            llm.n_tokens = common
+            llm.eval(tokens[common:])
+            self._store(prefix, llm.save_state())
+
+    def __contains__(self, prefix):
+        return prefix in self._states
+
+    def _store(self, prefix, state):
+        size = _state_bytes(state)
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+        previous = self._states.pop(prefix, None)
+        if previous is not None:
+            self.bytes -= previous[1]
+        self._states[prefix] = (state, size)
+        self.bytes += size
+        while len(self._states) > self.max_states or (self.max_bytes is not None and self.bytes > self.max_bytes):
+            _, (_, evicted) = self._states.popitem(last=False)
+            self.bytes -= evicted
+
+    def stats(self) -> dict:
+        return {'states': len(self._states), 'bytes': self.bytes, 'hits': self.hits, 'misses': self.misses}
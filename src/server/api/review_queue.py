@@ -0,0 +1,189 @@
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+from datetime import datetime
+from typing import Optional, Tuple
+
+from src.server.core import config
+from src.server.core.metrics import QUEUE_DEPTH
+
+
+@dataclass(frozen=True)
+class ReviewCard:
+    # Snapshot einer fälligen Karte inkl. allem, was die Review-Seite braucht
+    id: int
+    user_id: int
+    original_text: str
+    language_code: str
+    category: Optional[str]
+    score: float
+    review_count: int
+    next_review: datetime
+    target_languages: Tuple[str, ...]
+    translations: dict = field(default_factory=dict)
+
+
+class _UserQueue:
+    __slots__ = ('cards', 'ids', 'reviewed', 'loading', 'loaded_at', 'exhausted')
+
+    def __init__(self):
+        self.cards = deque()
+        self.ids = set()        # Karten, die noch in der Queue sind
+        self.reviewed = set()   # seit dem letzten Nachladen bewertete Karten
+        self.loading = False
+        self.loaded_at = time.monotonic()
+        self.exhausted = False
+
+
+class ReviewQueue:
+    """
+    Pro User die nächsten fälligen Karten im Speicher: die Review-Seite
+    nimmt die vorderste Karte ohne Query, bewertete Karten fallen in O(1)
+    heraus, und unter low_watermark wird im Hintergrund nachgeladen.
+
+    Jeder Server-Worker hat seine eigene Queue; eine auf einem anderen Worker
+    bewertete Karte bleibt hier bis zur TTL stehen. Vor dem Schreiben prüft
+    die Review-Seite daher next_review in der DB.
+    """
+
+    def __init__(self, size, low_watermark, ttl_seconds, empty_ttl_seconds, max_users, max_workers):
+        self.size = size
+        self.low_watermark = low_watermark
+        self.ttl_seconds = ttl_seconds
+        self.empty_ttl_seconds = empty_ttl_seconds
+        self.max_users = max_users
+        self._queues = OrderedDict()  # user_id -> _UserQueue
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="review-queue")
+
+    def peek(self, app, user_id):
+        """Vorderste fällige Karte (ReviewCard) oder None."""
+        with self._lock:
+            queue = self._current(user_id)
+            if queue is not None:
+                while queue.cards and queue.cards[0].id not in queue.ids:
+                    queue.cards.popleft()
+                if len(queue.ids) < self.low_watermark and not queue.loading and not queue.exhausted:
+                    queue.loading = True
+                    queue.reviewed = set()
+                    self._executor.submit(self._refill, app, user_id, queue, tuple(queue.ids))
+                if queue.cards or queue.exhausted:
+                    return queue.cards[0] if queue.cards else None
+
+        # leere oder abgelaufene Queue: einmal synchron laden
+        cards = app.manager.get_review_cards(user_id, self.size)
+        with self._lock:
+            queue = _UserQueue()
+            self._fill(queue, cards, self.size)
+            self._queues[user_id] = queue
+            self._queues.move_to_end(user_id)
+            while len(self._queues) > self.max_users:
+                self._queues.popitem(last=False)
+        return cards[0] if cards else None
+
+    def _current(self, user_id):
+        queue = self._queues.get(user_id)
+        if queue is None:
+            return None
+        ttl = self.empty_ttl_seconds if queue.exhausted and not queue.ids else self.ttl_seconds
+        if time.monotonic() - queue.loaded_at > ttl:
+            del self._queues[user_id]
+            return None
+        self._queues.move_to_end(user_id)
+        return queue
+
+    def _fill(self, queue, cards, requested):
+        for card in cards:
+            if card.id not in queue.ids and card.id not in queue.reviewed:
+                queue.cards.append(card)
+                queue.ids.add(card.id)
+        queue.exhausted = len(cards) < requested
+        queue.loaded_at = time.monotonic()
+
+    def _refill(self, app, user_id, queue, queued_ids):
+        requested = self.size - len(queued_ids)
+        try:
+            with app.app_context():
+                cards = app.manager.get_review_cards(user_id, requested, exclude_ids=queued_ids)
+            with self._lock:
+                # inzwischen invalidiert -> Ergebnis verwerfen
+                if self._queues.get(user_id) is queue:
+                    self._fill(queue, cards, requested)
+        except Exception as e:
+            print(f"Warning: refilling review queue of user {user_id} failed: {e}")
+        finally:
+            with self._lock:
+                queue.loading = False
+
+    def upcoming(self, user_id, count):
+        """Die nächsten count Karten in der Queue (ohne Query, ohne Nachladen)."""
+        with self._lock:
+            queue = self._queues.get(user_id)
+            if queue is None:
+                return []
+            return [card for card in queue.cards if card.id in queue.ids][:count]
+
+    def update_card(self, user_id, sentence_id, **changes):
+        # z.B. nachträglich erzeugte Referenzübersetzungen
+        with self._lock:
+            queue = self._queues.get(user_id)
+            if queue is None or sentence_id not in queue.ids:
+                return
+            for index, card in enumerate(queue.cards):
+                if card.id == sentence_id:
+                    queue.cards[index] = replace(card, **changes)
+                    return
+
+    def discard(self, user_id, sentence_id):
+        # Karte wurde bewertet (neues next_review) oder gelöscht
+        with self._lock:
+            queue = self._queues.get(user_id)
+            if queue is None:
+                return
+            queue.ids.discard(sentence_id)
+            queue.reviewed.add(sentence_id)
+            if queue.cards and queue.cards[0].id == sentence_id:
+                queue.cards.popleft()
+
+    def card_added(self, user_id):
+        # neue Karten sind sofort fällig; eine leere Queue soll sie nicht verstecken
+        with self._lock:
+            queue = self._queues.get(user_id)
+            if queue is not None and queue.exhausted:
+                del self._queues[user_id]
+
+    def invalidate(self, user_id=None):
+        with self._lock:
+            if user_id is None:
+                self._queues.clear()
+            else:
+                self._queues.pop(user_id, None)
+
+    def depth(self, user_id=None) -> int:
+        with self._lock:
+            if user_id is not None:
+                queue = self._queues.get(user_id)
+                return len(queue.ids) if queue else 0
+            return sum(len(queue.ids) for queue in self._queues.values())
+
+
+_review_queue = None
+_review_queue_lock = threading.Lock()
+
+
+def get_review_queue() -> ReviewQueue:
+    global _review_queue
+    with _review_queue_lock:
+        if _review_queue is None:
+            _review_queue = ReviewQueue(
+                size=config.REVIEW_QUEUE_SIZE,
+                low_watermark=config.REVIEW_QUEUE_LOW_WATERMARK,
+                ttl_seconds=config.REVIEW_QUEUE_TTL_SECONDS,
+                empty_ttl_seconds=config.REVIEW_QUEUE_EMPTY_TTL_SECONDS,
+                max_users=config.REVIEW_QUEUE_MAX_USERS,
+                max_workers=config.REVIEW_QUEUE_WORKERS,
+            )
+            QUEUE_DEPTH.set_function(_review_queue.depth, queue="review_queue")
+        return _review_queue
@@ -1,14 +1,25 @@
-from flask import Flask, jsonify, request, Blueprint, current_app, session, redirect, url_for, render_template
+from flask import Flask, jsonify, request, Blueprint, current_app, session, redirect, url_for, render_template, Response, stream_with_context
 from flask_sqlalchemy import SQLAlchemy
 from flask_restful import Api, Resource
 from flasgger import Swagger, swag_from
 from datetime import datetime
+import csv
+import io
+import json
+import zlib
 from src.server.models.data_models import db
 from src.server.data_manager import DataManager
 from src.server.models.api import (
     UserCreateRequest, UserCreateResponse, UserResponse,
-    SentenceCreateRequest, SentenceCreateResponse, SentenceResponse
+    SentenceCreateRequest, SentenceCreateResponse, SentenceResponse,
+    EvaluateItemRequest, EvaluateBatchRequest, EvaluateAsyncRequest, ReviewBatchRequest
 )
+from src.server.api.scoring_jobs import get_scoring_queue, QueueFullError
+from src.server.api.translation_cache import get_translation_cache
+from src.server.api.review_queue import get_review_queue
+from src.server.api.prefetch import get_prefetcher
+from src.server.core import config
+from src.server.scheduler import get_scheduler
 from pydantic import ValidationError
 
 
@@ -37,10 +48,8 @@ def create_or_login_user():
 
     user = None
     if "user_id" in session:
-        user = current_app.manager.get_user_by_id(session["user_id"])
-        # User Target Languages
-        langs = current_app.manager.get_user_languages(user.id)
-        user.target_languages = [l.language_code for l in langs]
+        # User incl. Target Languages (cached)
+        user = current_app.manager.get_user_profile(session["user_id"])
 
     return render_template("index.html", user=user)
 
@@ -82,9 +91,7 @@ def index():
     if "user_id" not in session:
         return redirect(url_for("api.create_or_login_user"))
 
-    user = current_app.manager.get_user_by_id(session["user_id"])
-    langs = current_app.manager.get_user_languages(user.id)
-    user.target_languages = [l.language_code for l in langs]
+    user = current_app.manager.get_user_profile(session["user_id"])
     return render_template("index.html", user=user)
 
 # ==================== USER MANAGEMENT ENDPOINTS ====================
@@ -405,8 +412,11 @@ def delete_user_language(user_id, language_code):
       404:
         description: User or language not found
     """
-    # This would require implementing a delete method in DataManager
-    return jsonify({'error': 'Not implemented yet'}), 501
+    if not current_app.manager.get_user_by_id(user_id):
+        return jsonify({'error': 'User not found'}), 404
+    if not current_app.manager.delete_user_language(user_id, language_code):
+        return jsonify({'error': 'Language not found'}), 404
+    return jsonify({'success': True}), 200
 
 
 @api_bp.route('/users/<int:user_id>', methods=['DELETE'])
@@ -424,6 +434,11 @@ def delete_user(user_id):
         type: integer
         required: true
         description: ID of the user to delete
+      - name: soft
+        in: query
+        type: boolean
+        required: false
+        description: Only mark the user as deleted and purge the data in the background (default from USER_SOFT_DELETE)
     responses:
       200:
         description: User deleted successfully
@@ -436,13 +451,80 @@ def delete_user(user_id):
       404:
         description: User not found
     """
-    success = current_app.manager.delete_user(user_id)
+    soft = request.args.get('soft', str(config.USER_SOFT_DELETE)).lower() == 'true'
+    success = current_app.manager.delete_user(user_id, soft=soft)
     if success:
         return jsonify({'success': True}), 200
     else:
         return jsonify({'error': 'User not found'}), 404
 
 
+@api_bp.route('/users/<int:user_id>/export', methods=['GET'])
+def export_user(user_id):
+    """
+    Export a user's learning history
+    ---
+    tags:
+      - Users
+    summary: Stream NDJSON export
+    description: >
+      Streams the user profile, target languages, all sentences and all sessions
+      as newline-delimited JSON, one object per line with a "type" field.
+      With format=gzip the stream is gzip-compressed.
+    parameters:
+      - name: user_id
+        in: path
+        type: integer
+        required: true
+        description: ID of the user
+      - name: format
+        in: query
+        type: string
+        enum: [ndjson, gzip]
+        default: ndjson
+        required: false
+    produces:
+      - application/x-ndjson
+      - application/gzip
+    responses:
+      200:
+        description: NDJSON stream
+      400:
+        description: Unsupported format
+      404:
+        description: User not found
+    """
+    export_format = request.args.get('format', 'ndjson')
+    if export_format not in ('ndjson', 'gzip'):
+        return jsonify({'error': 'format must be ndjson or gzip'}), 400
+    if not current_app.manager.get_user_by_id(user_id):
+        return jsonify({'error': 'User not found'}), 404
+
+    def generate_lines():
+        for record in current_app.manager.iter_user_export(user_id):
+            yield json.dumps(record, ensure_ascii=False) + '\n'
+
+    def generate_gzip():
+        compressor = zlib.compressobj(wbits=31)  # gzip container
+        for line in generate_lines():
+            chunk = compressor.compress(line.encode('utf-8'))
+            if chunk:
+                yield chunk
+        yield compressor.flush()
+
+    filename = f'user_{user_id}_export.ndjson'
+    if export_format == 'gzip':
+        body, mimetype, filename = generate_gzip(), 'application/gzip', filename + '.gz'
+    else:
+        body, mimetype = generate_lines(), 'application/x-ndjson'
+
+    return Response(
+        stream_with_context(body),
+        mimetype=mimetype,
+        headers={'Content-Disposition': f'attachment; filename={filename}'}
+    )
+
+
 # ==================== SENTENCES MANAGEMENT ENDPOINTS ====================
 
 @api_bp.route("/add_sentence", methods=["GET", "POST"])
@@ -450,13 +532,11 @@ def add_sentence_page():
     if "user_id" not in session:
         return redirect(url_for("ui.create_or_login_user"))
 
-    user = current_app.manager.get_user_by_id(session["user_id"])
-    langs = current_app.manager.get_user_languages(user.id)
-    user.target_languages = [l.language_code for l in langs]
+    user = current_app.manager.get_user_profile(session["user_id"])
 
     if request.method == "POST":
         original_text = request.form.get("original_text")
-        sentence = current_app.manager.create_sentence(user.id, original_text, category="general")
+        sentence = current_app.manager.add_sentence_with_translations(user.id, original_text, category="general")
 
         # Create initial session with translations if provided
         session_input = {}
@@ -650,7 +730,7 @@ def create_sentence():
             return jsonify({'error': 'User not found'}), 404
         
         # Create sentence with default progress values
-        sentence = current_app.manager.create_sentence(
+        sentence = current_app.manager.add_sentence_with_translations(
             user_id=sentence_request.user_id,
             original_text=sentence_request.original_text,
             category=sentence_request.category
@@ -670,24 +750,188 @@ def create_sentence():
         return jsonify({'error': 'Server error', 'details': str(e)}), 500
 
 
+def _iter_bulk_rows():
+    """
+    Yields sentence rows from the request body: a JSON array (or an object
+    with a "sentences" list), JSON lines, or CSV with a header row.
+    JSONL and CSV are read line by line from the request stream.
+    """
+    content_type = (request.mimetype or '').lower()
+
+    if content_type in ('application/x-ndjson', 'application/jsonl', 'application/x-jsonlines'):
+        for line in io.TextIOWrapper(request.stream, encoding='utf-8'):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError:
+                # reported as row error by bulk_create_sentences
+                yield line
+
+    elif content_type == 'text/csv':
+        reader = csv.DictReader(io.TextIOWrapper(request.stream, encoding='utf-8', newline=''))
+        for row in reader:
+            yield {key: value for key, value in row.items() if key}
+
+    else:
+        data = request.get_json(silent=True)
+        if isinstance(data, dict):
+            data = data.get('sentences', [])
+        for row in data or []:
+            yield row
+
+
+@api_bp.route('/sentences/bulk', methods=['POST'])
+def bulk_create_sentences():
+    """
+    Import many sentences at once
+    ---
+    tags:
+      - Sentences
+    summary: Bulk sentence import
+    description: >
+      Imports a user's phrase list in chunked bulk inserts. Accepts a JSON body
+      ({"user_id": 1, "sentences": [...]}), JSON lines (application/x-ndjson) or CSV
+      (text/csv, header "original_text,category"). For JSONL and CSV pass user_id as
+      query parameter. Invalid rows are reported and skipped, the rest is imported.
+      Reference translations come from the global translation cache or are
+      generated in the background, like for single sentences.
+    consumes:
+      - application/json
+      - application/x-ndjson
+      - text/csv
+    parameters:
+      - name: user_id
+        in: query
+        type: integer
+        required: false
+        description: ID of the user (required for JSONL/CSV bodies)
+      - name: body
+        in: body
+        required: true
+        schema:
+          type: object
+          properties:
+            user_id:
+              type: integer
+              example: 1
+            sentences:
+              type: array
+              items:
+                type: object
+                properties:
+                  original_text:
+                    type: string
+                    example: "Ich fahre zur Arbeit"
+                  category:
+                    type: string
+                    example: "Arbeit"
+    responses:
+      200:
+        description: Import result with per-row errors
+        schema:
+          type: object
+          properties:
+            created:
+              type: integer
+              example: 998
+            failed:
+              type: integer
+              example: 2
+            errors:
+              type: array
+              items:
+                type: object
+                properties:
+                  row:
+                    type: integer
+                  error:
+                    type: object
+      400:
+        description: Missing user_id
+      404:
+        description: User not found
+    """
+    user_id = request.args.get('user_id', type=int)
+    if user_id is None and request.is_json:
+        data = request.get_json(silent=True)
+        if isinstance(data, dict):
+            user_id = data.get('user_id')
+    if not isinstance(user_id, int):
+        return jsonify({'error': 'user_id is required'}), 400
+
+    try:
+        result = current_app.manager.bulk_create_sentences(user_id, _iter_bulk_rows())
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 404
+    except Exception as e:
+        return jsonify({'error': 'Server error', 'details': str(e)}), 500
+
+    return jsonify(result), 200
+
+
 @api_bp.route('/sentences/<int:user_id>', methods=['GET'])
 def get_sentences(user_id):
     """
-    Get all sentences for a user
+    Get sentences for a user
     ---
     tags:
       - Sentences
-    summary: Get user sentences
-    description: Returns all sentences for a specific user.
+    summary: Get user sentences (paginated)
+    description: >
+      Returns one page of a user's sentences ordered by id. Pass the value of the
+      X-Next-After-Id response header as after_id to get the next page; the header
+      is missing on the last page.
     parameters:
       - name: user_id
         in: path
         type: integer
         required: true
         description: ID of the user
+      - name: after_id
+        in: query
+        type: integer
+        required: false
+        description: Return sentences with an id greater than this (cursor)
+      - name: limit
+        in: query
+        type: integer
+        required: false
+        default: 100
+        description: Page size (1-1000)
+      - name: category
+        in: query
+        type: string
+        required: false
+        description: Only sentences of this category
+      - name: due_before
+        in: query
+        type: string
+        format: date-time
+        required: false
+        description: Only sentences with next_review at or before this ISO timestamp
+      - name: min_score
+        in: query
+        type: number
+        required: false
+      - name: max_score
+        in: query
+        type: number
+        required: false
+      - name: fields
+        in: query
+        type: string
+        required: false
+        description: Comma-separated list of fields to return (id is always included)
+        example: "id,original_text,score"
     responses:
       200:
         description: List of user's sentences
+        headers:
+          X-Next-After-Id:
+            type: integer
+            description: Cursor for the next page
         schema:
           type: array
           items:
@@ -703,28 +947,46 @@ def get_sentences(user_id):
                 type: string
               category:
                 type: string
+              score:
+                type: number
+              last_review:
+                type: string
+              next_review:
+                type: string
+              review_count:
+                type: integer
               created_at:
                 type: string
-      404:
-        description: User not found
+      400:
+        description: Invalid query parameter
     """
     try:
-        sentences = current_app.manager.get_sentences_for_user(user_id)
-        sentences_list = []
-        for sentence in sentences:
-            sentences_list.append({
-                'id': sentence.id,
-                'user_id': sentence.user_id,
-                'original_text': sentence.original_text,
-                'language_code': sentence.language_code,
-                'category': sentence.category,
-                'score': sentence.score,
-                'last_review': sentence.last_review.isoformat() if sentence.last_review else None,
-                'next_review': sentence.next_review.isoformat() if sentence.next_review else None,
-                'review_count': sentence.review_count,
-                'created_at': sentence.created_at.isoformat() if sentence.created_at else None
-            })
-        return jsonify(sentences_list)
+        due_before = request.args.get('due_before')
+        due_before = datetime.fromisoformat(due_before) if due_before else None
+    except ValueError:
+        return jsonify({'error': 'due_before must be an ISO timestamp'}), 400
+
+    fields = request.args.get('fields')
+    limit = min(max(request.args.get('limit', 100, type=int), 1), 1000)
+
+    try:
+        sentences_list, next_after_id = current_app.manager.list_sentences(
+            user_id,
+            after_id=request.args.get('after_id', type=int),
+            limit=limit,
+            category=request.args.get('category'),
+            due_before=due_before,
+            min_score=request.args.get('min_score', type=float),
+            max_score=request.args.get('max_score', type=float),
+            fields=[f.strip() for f in fields.split(',')] if fields else None
+        )
+        response = jsonify(sentences_list)
+        if next_after_id is not None:
+            response.headers['X-Next-After-Id'] = str(next_after_id)
+            response.headers['Link'] = '<{}>; rel="next"'.format(url_for(
+                'api.get_sentences', user_id=user_id, **{**request.args.to_dict(), 'after_id': next_after_id}
+            ))
+        return response
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -809,29 +1071,264 @@ def get_sentence_page():
         return redirect(url_for("ui.create_or_login_user"))
 
     user_id = session["user_id"]
-    due_sentences = current_app.manager.get_due_sentences(user_id)
-    sentence = due_sentences[0] if due_sentences else None
+    if request.method == "GET":
+        # next due card from the in-memory review queue (no query while it's warm)
+        card = get_review_queue().peek(current_app._get_current_object(), user_id)
+        if config.PREFETCH_ENABLED:
+            # prepare this and the next cards while the learner is typing
+            get_prefetcher().schedule(current_app._get_current_object(), get_llm_adapter(), get_review_queue(), user_id)
+        return render_template(
+            "get_sentence.html", sentence=card, target_languages=card.target_languages if card else ()
+        )
 
-    if request.method == "POST" and sentence:
-        user_answers = {}
-        # Get user answers from form - you'll need to adapt this based on your form structure
-        user_answer = request.form.get("user_answer")
-        
-        # Create session to track this attempt
-        session_input = {
-            'user_answer': user_answer,
-            'review_type': 'sentence_practice'
-        }
-        
-        # Simple scoring for now
-        score = 0.8  # Placeholder
-        is_success = score >= 0.7
-        
-        current_app.manager.create_session(user_id, sentence.id, session_input, score)
-        current_app.manager.update_sentence_progress(sentence.id, score, is_success)
-        return redirect(url_for("ui.index"))
+    # POST: score the card the learner was shown (hidden sentence_id), not the front of
+    # this worker's queue - GET and POST may be served by different server workers
+    sentence = current_app.manager.get_sentence_by_id(request.form.get("sentence_id", type=int) or 0)
+    if not sentence or sentence.user_id != user_id:
+        return render_template("get_sentence.html", sentence=None, target_languages=(), error="Sentence not found"), 404
+    profile = current_app.manager.get_user_profile(user_id)
+    target_languages = profile.target_languages if profile else ()
+    if sentence.next_review and sentence.next_review > datetime.utcnow():
+        # already reviewed, e.g. in another tab or on another worker
+        get_review_queue().discard(user_id, sentence.id)
+        return render_template(
+            "get_sentence.html", sentence=None, target_languages=(),
+            error="This sentence was already reviewed, your answer was not recorded"
+        ), 409
+
+    user_answers = {}
+    # one field per target language, like in add_sentence_page
+    for language_code in target_languages:
+        answer = request.form.get(f"translation_{language_code}")
+        if answer:
+            user_answers[language_code] = answer
+    user_answer = request.form.get("user_answer")
+    # free-text answer is scored, but it's no language: keep it out of 'translations' (per-language stats)
+    scored_answers = user_answers or ({'answer': user_answer} if user_answer else {})
+
+    # Create session to track this attempt
+    session_input = {
+        'user_answer': user_answer,
+        'translations': user_answers,
+        'review_type': 'sentence_practice'
+    }
+
+    # LLM score (0-100) goes through the score cache first
+    try:
+        references = current_app.manager.get_translations(sentence.id)
+        score = get_llm_adapter().score_answer(sentence.original_text, {'translations': scored_answers}, references) / 100 if scored_answers else 0.0
+    except ScoreParseError:
+        # don't record a fake 0 for the learner, let them submit again
+        return render_template(
+            "get_sentence.html", sentence=sentence, target_languages=target_languages,
+            error="Scoring failed, please try again"
+        )
 
-    return render_template("get_sentence.html", sentence=sentence)
+    # session, progress and stats in one transaction
+    current_app.manager.record_review(user_id, sentence.id, session_input, score)
+    return redirect(url_for("ui.index"))
+
+
+@api_bp.route('/review/due/<int:user_id>', methods=['GET'])
+def get_due_cards(user_id):
+    """
+    Get due cards for review
+    ---
+    tags:
+      - Learning
+    summary: Most overdue cards first
+    description: Returns up to `limit` due sentences, ordered by next_review (oldest first).
+    parameters:
+      - name: user_id
+        in: path
+        type: integer
+        required: true
+        description: ID of the user
+      - name: limit
+        in: query
+        type: integer
+        required: false
+        default: 10
+        description: Maximum number of cards (1-100)
+      - name: category
+        in: query
+        type: string
+        required: false
+        description: Only cards of this category
+    responses:
+      200:
+        description: List of due sentences
+        schema:
+          type: array
+          items:
+            type: object
+            properties:
+              id:
+                type: integer
+              original_text:
+                type: string
+              category:
+                type: string
+              score:
+                type: number
+              next_review:
+                type: string
+              review_count:
+                type: integer
+    """
+    limit = min(max(request.args.get('limit', 10, type=int), 1), 100)
+    category = request.args.get('category')
+    try:
+        sentences = current_app.manager.get_next_due(user_id, limit=limit, category=category)
+        return jsonify([{
+            'id': sentence.id,
+            'original_text': sentence.original_text,
+            'language_code': sentence.language_code,
+            'category': sentence.category,
+            'score': sentence.score,
+            'next_review': sentence.next_review.isoformat() if sentence.next_review else None,
+            'review_count': sentence.review_count
+        } for sentence in sentences])
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@api_bp.route('/review/schedule/<int:user_id>', methods=['POST'])
+def reschedule_user_deck(user_id):
+    """
+    Reschedule a user's whole deck
+    ---
+    tags:
+      - Learning
+    summary: Recompute next_review for all reviewed cards
+    description: >
+      Recomputes every reviewed card's next_review from its stored scheduler state
+      with the current scheduler parameters (SCHEDULER_ALGORITHM, SM2_INTERVAL_MODIFIER,
+      FSRS_REQUEST_RETENTION, SCHEDULER_MAX_INTERVAL_DAYS) in bulk.
+    parameters:
+      - name: user_id
+        in: path
+        type: integer
+        required: true
+        description: ID of the user
+      - name: algorithm
+        in: query
+        type: string
+        enum: [sm2, fsrs]
+        required: false
+        description: Scheduler to use instead of the configured one
+    responses:
+      200:
+        description: Number of rescheduled cards
+        schema:
+          type: object
+          properties:
+            success:
+              type: boolean
+            rescheduled:
+              type: integer
+      400:
+        description: Unknown scheduler
+      404:
+        description: User not found
+    """
+    if not current_app.manager.get_user_by_id(user_id):
+        return jsonify({'error': 'User not found'}), 404
+    try:
+        scheduler = get_scheduler(request.args.get('algorithm'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    try:
+        count = current_app.manager.reschedule_deck(user_id, scheduler=scheduler)
+        return jsonify({'success': True, 'rescheduled': count}), 200
+    except Exception as e:
+        return jsonify({'error': 'Server error', 'details': str(e)}), 500
+
+
+@api_bp.route('/review/submit/<int:user_id>', methods=['POST'])
+def submit_reviews(user_id):
+    """
+    Submit reviews in bulk
+    ---
+    tags:
+      - Learning
+    summary: Record already scored reviews, e.g. from an offline client
+    description: >
+      Writes the sessions and updates progress and stats in one transaction
+      (flushed every 500 reviews). Reviews are applied in reviewed_at order; a review older than
+      the card's last review is kept as a session but doesn't change its progress.
+      Either all reviews are recorded or none (unknown sentence -> 404).
+    parameters:
+      - name: user_id
+        in: path
+        type: integer
+        required: true
+        description: ID of the user
+      - name: body
+        in: body
+        required: true
+        schema:
+          type: object
+          properties:
+            reviews:
+              type: array
+              items:
+                type: object
+                properties:
+                  sentence_id:
+                    type: integer
+                  input:
+                    type: object
+                    example: {"translations": {"it": "Vado al lavoro"}}
+                  score:
+                    type: number
+                    example: 0.8
+                  reviewed_at:
+                    type: string
+                    format: date-time
+    responses:
+      201:
+        description: Reviews recorded
+        schema:
+          type: object
+          properties:
+            success:
+              type: boolean
+            recorded:
+              type: integer
+            session_ids:
+              type: array
+              items:
+                type: integer
+      400:
+        description: Validation failed
+      404:
+        description: User or sentence not found
+    """
+    data = request.get_json()
+    if not data:
+        return jsonify({'error': 'No JSON data provided'}), 400
+    try:
+        review_request = ReviewBatchRequest(**data)
+    except ValidationError as e:
+        return jsonify({'error': 'Validation failed', 'details': e.errors()}), 400
+
+    if not current_app.manager.get_user_by_id(user_id):
+        return jsonify({'error': 'User not found'}), 404
+    try:
+        sessions = current_app.manager.record_review(
+            user_id, reviews=[review.model_dump() for review in review_request.reviews]
+        )
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 404
+
+    return jsonify({
+        'success': True,
+        'recorded': len(sessions),
+        'session_ids': [session.id for session in sessions]
+    }), 201
 
 
 @api_bp.route('/sentences/<int:sentence_id>', methods=['DELETE'])
@@ -868,6 +1365,80 @@ def delete_sentence(sentence_id):
         return jsonify({'error': 'Sentence not found'}), 404
 
 
+@api_bp.route('/sentences/<int:sentence_id>/translations', methods=['GET'])
+def get_sentence_translations(sentence_id):
+    """
+    Get stored reference translations of a sentence
+    ---
+    tags:
+      - Sentences
+    summary: AI reference translations
+    description: Returns the precomputed reference translations per target language. Languages whose translation is still being generated in the background are missing.
+    parameters:
+      - name: sentence_id
+        in: path
+        type: integer
+        required: true
+        description: ID of the sentence
+    responses:
+      200:
+        description: Translations by language code
+        schema:
+          type: object
+          properties:
+            sentence_id:
+              type: integer
+            translations:
+              type: object
+              example: {"es": "Hola mundo"}
+      404:
+        description: Sentence not found
+    """
+    if not current_app.manager.get_sentence_by_id(sentence_id):
+        return jsonify({'error': 'Sentence not found'}), 404
+    return jsonify({
+        'sentence_id': sentence_id,
+        'translations': current_app.manager.get_translations(sentence_id)
+    }), 200
+
+
+@api_bp.route('/translations/cache/stats', methods=['GET'])
+def translation_cache_stats():
+    """
+    Translation cache statistics
+    ---
+    tags:
+      - Sentences
+    summary: Cross-user translation cache hit/miss counters
+    description: Shows how many reference translations were reused from other users' sentences instead of being generated by the LLM.
+    responses:
+      200:
+        description: Cache counters
+        schema:
+          type: object
+          properties:
+            hits:
+              type: integer
+            memory_hits:
+              type: integer
+            persistent_hits:
+              type: integer
+            misses:
+              type: integer
+            hit_ratio:
+              type: number
+            llm_calls_saved:
+              type: integer
+            size:
+              type: integer
+            referenced:
+              type: integer
+            evictions:
+              type: integer
+    """
+    return jsonify(get_translation_cache().stats()), 200
+
+
 # ------------------- EDIT SENTENCES -------------------
 @api_bp.route("/edit_sentences", methods=["GET"])
 def edit_sentences_page():
@@ -898,10 +1469,7 @@ def edit_sentence_page(sentence_id):
 
 # ==================== LEARNING MANAGEMENT ENDPOINTS ====================
 
-from flask import current_app, request, jsonify
-from src.server.api.llm_adapter import LLMAdapter
-
-llm = LLMAdapter()
+from src.server.api.llm_adapter import get_llm_adapter, ScoreParseError
 
 # @api_bp.route("/<int>sentence_id/<int>user_id/evaluate_sentence", methods=["POST"])
 # def evaluate_sentence(sentence_id=int, user_id=int, target_languages):
@@ -936,10 +1504,28 @@ def get_learning_stats(user_id):
         schema:
           type: object
           properties:
-            total_reviews:
+            total_sentences:
               type: integer
-            avg_success_rate:
+            total_sessions:
+              type: integer
+            avg_score:
+              type: number
+            avg_session_score:
               type: number
+            due_today:
+              type: integer
+            current_streak:
+              type: integer
+            longest_streak:
+              type: integer
+            last_review_date:
+              type: string
+            categories:
+              type: object
+              description: Per category {count, avg_score} of the sentences
+            languages:
+              type: object
+              description: Per target language {count, avg_score} of the scored sessions
       404:
         description: User not found
     """
@@ -947,6 +1533,8 @@ def get_learning_stats(user_id):
         stats = current_app.manager.get_learning_stats(user_id)
         return jsonify(stats)
         
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 404
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -960,5 +1548,382 @@ def evaluate_answer():
     if not user_answer or not correct_answer:
         return jsonify({"error": "Missing fields"}), 400
 
-    score = llm.score_answer(user_answer, correct_answer)
+    try:
+        score = get_llm_adapter().score_answer(user_answer, correct_answer, data.get("references"))
+    except ScoreParseError as e:
+        return jsonify({"error": "Scoring failed", "details": str(e)}), 502
     return jsonify({"score": score}), 200
+
+
+def _sse(event, data):
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+@api_bp.route("/evaluate/stream", methods=["POST"])
+def evaluate_answer_stream():
+    """
+    Evaluate an answer with streamed feedback
+    ---
+    tags:
+      - Learning
+    summary: Score first, then feedback tokens (Server-Sent Events)
+    description: >
+      Responds with text/event-stream. The first event is `score` as soon as the
+      score is known (pre-scorer, cache or a short LLM call), followed by `feedback`
+      events with the feedback text piece by piece and a final `done` event.
+      Scoring failures are sent as an `error` event.
+    parameters:
+      - name: body
+        in: body
+        required: true
+        schema:
+          type: object
+          properties:
+            to_translate:
+              type: string
+              example: "Ich fahre zur Arbeit"
+            translations:
+              type: object
+              example: {"translations": [{"it": "Vado al lavoro"}]}
+            references:
+              type: object
+              example: {"it": "Vado al lavoro"}
+    produces:
+      - text/event-stream
+    responses:
+      200:
+        description: "Event stream, e.g. `event: score` / `data: {\"score\": 85}`, then `event: feedback` / `data: {\"text\": \"Only missing\"}`"
+      400:
+        description: Validation failed
+    """
+    data = request.get_json()
+    if not data:
+        return jsonify({'error': 'No JSON data provided'}), 400
+    try:
+        item = EvaluateItemRequest(**data)
+    except ValidationError as e:
+        return jsonify({'error': 'Validation failed', 'details': e.errors()}), 400
+
+    llm = get_llm_adapter()
+
+    def generate():
+        try:
+            for event, value in llm.evaluate_stream(item.to_translate, item.translations, item.references):
+                if event == "score":
+                    yield _sse("score", {"score": value})
+                else:
+                    yield _sse("feedback", {"text": value})
+        except ScoreParseError as e:
+            yield _sse("error", {"error": "Scoring failed", "details": str(e)})
+            return
+        except Exception as e:
+            yield _sse("error", {"error": "Feedback failed", "details": str(e)})
+            return
+        yield _sse("done", {})
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype="text/event-stream",
+        # no proxy buffering, otherwise the score only arrives with the last token
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@api_bp.route("/evaluate/cache/stats", methods=["GET"])
+def evaluate_cache_stats():
+    """
+    Score cache statistics
+    ---
+    tags:
+      - Learning
+    summary: Score cache hit/miss counters
+    description: Shows how many LLM scoring calls were answered from the score cache.
+    responses:
+      200:
+        description: Cache counters
+        schema:
+          type: object
+          properties:
+            hits:
+              type: integer
+            memory_hits:
+              type: integer
+            persistent_hits:
+              type: integer
+            misses:
+              type: integer
+            hit_ratio:
+              type: number
+            llm_calls_saved:
+              type: integer
+            memory_size:
+              type: integer
+            persistent_size:
+              type: integer
+    """
+    return jsonify(get_llm_adapter().cache.stats()), 200
+
+
+@api_bp.route("/evaluate/prescorer/stats", methods=["GET"])
+def evaluate_prescorer_stats():
+    """
+    Pre-scorer statistics
+    ---
+    tags:
+      - Learning
+    summary: Local pre-scorer decision rate
+    description: Shows how many answers were decided locally without an LLM call.
+    responses:
+      200:
+        description: Pre-scorer counters
+        schema:
+          type: object
+          properties:
+            enabled:
+              type: boolean
+            decided:
+              type: integer
+            deferred_to_llm:
+              type: integer
+            decision_rate:
+              type: number
+            accept_threshold:
+              type: number
+            reject_threshold:
+              type: number
+    """
+    return jsonify(get_llm_adapter().prescorer.stats()), 200
+
+
+@api_bp.route("/evaluate/prefetch/stats", methods=["GET"])
+def evaluate_prefetch_stats():
+    """
+    Review prefetch statistics
+    ---
+    tags:
+      - Learning
+    summary: Speculative preparation of upcoming cards
+    description: Shows how many upcoming cards got their reference translations and warmed prompt state before the answer came in.
+    responses:
+      200:
+        description: Prefetch counters
+        schema:
+          type: object
+          properties:
+            pending:
+              type: integer
+            translated:
+              type: integer
+            warmed:
+              type: integer
+            prefix_cache:
+              type: object
+    """
+    return jsonify({
+        **get_prefetcher().stats(),
+        'prefix_cache': get_llm_adapter().prefix_cache.stats()
+    }), 200
+
+
+@api_bp.route("/evaluate/batch", methods=["POST"])
+def evaluate_answers_batch():
+    """
+    Evaluate many answers at once
+    ---
+    tags:
+      - Learning
+    summary: Batch evaluation
+    description: Scores many (sentence, translations) pairs with as few LLM calls as possible.
+    parameters:
+      - name: body
+        in: body
+        required: true
+        schema:
+          type: object
+          properties:
+            items:
+              type: array
+              items:
+                type: object
+                properties:
+                  to_translate:
+                    type: string
+                    example: "Ich fahre zur Arbeit"
+                  translations:
+                    type: object
+                    example: {"translations": [{"it": "Vado al lavoro"}, {"vi": "Toi di lam"}]}
+                  references:
+                    type: object
+                    description: Optional reference translations per language for the local pre-scorer
+                    example: {"it": "Vado al lavoro", "vi": "Tôi đi làm"}
+          required:
+            - items
+    responses:
+      200:
+        description: Per-item scores in request order
+        schema:
+          type: object
+          properties:
+            count:
+              type: integer
+              example: 1
+            results:
+              type: array
+              items:
+                type: object
+                properties:
+                  index:
+                    type: integer
+                  score:
+                    type: integer
+      400:
+        description: Invalid input data
+    """
+    data = request.get_json()
+    if not data:
+        return jsonify({'error': 'No JSON data provided'}), 400
+
+    try:
+        batch_request = EvaluateBatchRequest(**data)
+    except ValidationError as e:
+        return jsonify({'error': 'Validation failed', 'details': e.errors()}), 400
+
+    items = [item.model_dump() for item in batch_request.items]
+    try:
+        scores = get_llm_adapter().score_answers_batch(items)
+    except (KeyError, TypeError, AttributeError) as e:
+        return jsonify({'error': 'Invalid translations format', 'details': str(e)}), 400
+    except ScoreParseError as e:
+        return jsonify({'error': 'Scoring failed', 'details': str(e)}), 502
+
+    return jsonify({
+        'count': len(scores),
+        'results': [{'index': i, 'score': score} for i, score in enumerate(scores)]
+    }), 200
+
+
+@api_bp.route("/evaluate/async", methods=["POST"])
+def evaluate_answer_async():
+    """
+    Evaluate an answer asynchronously
+    ---
+    tags:
+      - Learning
+    summary: Enqueue a scoring job
+    description: Returns a job ID immediately. A background worker scores the answer, stores the session and updates the sentence progress.
+    parameters:
+      - name: body
+        in: body
+        required: true
+        schema:
+          type: object
+          properties:
+            user_id:
+              type: integer
+              example: 1
+            sentence_id:
+              type: integer
+              example: 1
+            translations:
+              type: object
+              example: {"translations": [{"it": "Vado al lavoro"}]}
+            references:
+              type: object
+              example: {"it": "Vado al lavoro"}
+          required:
+            - user_id
+            - sentence_id
+            - translations
+    responses:
+      202:
+        description: Job accepted
+        schema:
+          type: object
+          properties:
+            job_id:
+              type: string
+            status:
+              type: string
+              example: "queued"
+            status_url:
+              type: string
+      400:
+        description: Invalid input data
+      404:
+        description: Sentence not found
+      503:
+        description: Scoring queue is full, retry later
+    """
+    data = request.get_json()
+    if not data:
+        return jsonify({'error': 'No JSON data provided'}), 400
+
+    try:
+        evaluate_request = EvaluateAsyncRequest(**data)
+    except ValidationError as e:
+        return jsonify({'error': 'Validation failed', 'details': e.errors()}), 400
+
+    sentence = current_app.manager.get_sentence_by_id(evaluate_request.sentence_id)
+    if not sentence or sentence.user_id != evaluate_request.user_id:
+        return jsonify({'error': 'Sentence not found'}), 404
+
+    try:
+        job_id = get_scoring_queue().submit(
+            current_app._get_current_object(),
+            get_llm_adapter(),
+            evaluate_request.user_id,
+            sentence.id,
+            sentence.original_text,
+            evaluate_request.translations,
+            evaluate_request.references or current_app.manager.get_translations(sentence.id)
+        )
+    except QueueFullError as e:
+        return jsonify({'error': str(e)}), 503, {'Retry-After': '1'}
+
+    return jsonify({
+        'job_id': job_id,
+        'status': 'queued',
+        'status_url': url_for('api.get_evaluate_job', job_id=job_id)
+    }), 202
+
+
+@api_bp.route("/evaluate/jobs/<string:job_id>", methods=["GET"])
+def get_evaluate_job(job_id):
+    """
+    Poll an asynchronous scoring job
+    ---
+    tags:
+      - Learning
+    summary: Get scoring job status
+    parameters:
+      - name: job_id
+        in: path
+        type: string
+        required: true
+        description: Job ID returned by /evaluate/async
+    responses:
+      200:
+        description: Job status (queued, running, done or failed)
+        schema:
+          type: object
+          properties:
+            job_id:
+              type: string
+            status:
+              type: string
+            score:
+              type: number
+              description: 0-1 like the stored session score (/evaluate and /evaluate/batch return 0-100)
+              example: 0.85
+            session_id:
+              type: integer
+            error:
+              type: string
+      404:
+        description: Job not found
+    """
+    # status is in the database: any server worker can answer
+    job = current_app.manager.get_scoring_job(job_id)
+    if not job:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify(job), 200
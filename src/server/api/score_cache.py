@@ -0,0 +1,168 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+
+from src.server.core import config
+
+
+def _normalize_text(text) -> str:
+    # gleiche Eingaben mit anderer Unicode-Form / Leerzeichen -> gleicher Key
+    text = unicodedata.normalize("NFC", str(text))
+    return " ".join(text.split())
+
+
+class ScoreCache:
+    """
+    Zweistufiger Cache für LLM-Scores: In-Process-LRU vor einer
+    SQLite-Tabelle mit TTL und Größenbegrenzung.
+    """
+
+    # Eviction nur alle N Schreibzugriffe, nicht bei jedem set()
+    EVICT_EVERY = 200
+
+    def __init__(self, path, memory_size, ttl_seconds, max_entries):
+        self.memory_size = memory_size
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._memory = OrderedDict()  # key -> (score, created_at)
+        self._lock = threading.Lock()
+        self._writes = 0
+
+        self.memory_hits = 0
+        self.persistent_hits = 0
+        self.misses = 0
+
+        self.path = path
+        self._pid = None
+        self._connection = None
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS score_cache ("
+            " key TEXT PRIMARY KEY,"
+            " score REAL NOT NULL,"
+            " created_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS ix_score_cache_created_at ON score_cache (created_at)"
+        )
+        self._conn.commit()
+
+    @property
+    def _conn(self):
+        # eine Verbindung pro Prozess: nach einem fork() (gunicorn preload) neu öffnen
+        if self._pid != os.getpid():
+            self._connection = sqlite3.connect(
+                self.path, check_same_thread=False, timeout=config.SQLITE_BUSY_TIMEOUT_MS / 1000
+            )
+            # mehrere Server-Worker schreiben in dieselbe Datei
+            if config.SQLITE_WAL:
+                self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(f"PRAGMA synchronous={config.SQLITE_SYNCHRONOUS}")
+            self._pid = os.getpid()
+        return self._connection
+
+    @staticmethod
+    def make_key(to_translate, translations: dict, provider, model) -> str:
+        payload = json.dumps({
+            "to_translate": _normalize_text(to_translate),
+            "translations": {
+                _normalize_text(lang).lower(): _normalize_text(text)
+                for lang, text in translations.items()
+            },
+            "provider": provider,
+            "model": model,
+        }, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                # gleiche TTL wie in der SQLite-Stufe
+                if time.time() - entry[1] <= self.ttl_seconds:
+                    self._memory.move_to_end(key)
+                    self.memory_hits += 1
+                    return entry[0]
+                del self._memory[key]
+
+            row = self._conn.execute(
+                "SELECT score, created_at FROM score_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row and time.time() - row[1] <= self.ttl_seconds:
+                self.persistent_hits += 1
+                self._remember(key, row[0], row[1])
+                return row[0]
+
+            self.misses += 1
+            return None
+
+    def set(self, key, score):
+        with self._lock:
+            created_at = time.time()
+            self._remember(key, score, created_at)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO score_cache (key, score, created_at) VALUES (?, ?, ?)",
+                (key, score, created_at)
+            )
+            self._conn.commit()
+
+            self._writes += 1
+            if self._writes % self.EVICT_EVERY == 0:
+                self._evict()
+
+    def _remember(self, key, score, created_at):
+        self._memory[key] = (score, created_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def _evict(self):
+        # abgelaufene Einträge, danach die ältesten über max_entries
+        self._conn.execute(
+            "DELETE FROM score_cache WHERE created_at < ?",
+            (time.time() - self.ttl_seconds,)
+        )
+        self._conn.execute(
+            "DELETE FROM score_cache WHERE key IN ("
+            " SELECT key FROM score_cache ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,)
+        )
+        self._conn.commit()
+
+    def stats(self) -> dict:
+        with self._lock:
+            hits = self.memory_hits + self.persistent_hits
+            lookups = hits + self.misses
+            persistent_size = self._conn.execute("SELECT COUNT(*) FROM score_cache").fetchone()[0]
+            return {
+                'hits': hits,
+                'memory_hits': self.memory_hits,
+                'persistent_hits': self.persistent_hits,
+                'misses': self.misses,
+                'hit_ratio': hits / lookups if lookups else 0.0,
+                'llm_calls_saved': hits,
+                'memory_size': len(self._memory),
+                'persistent_size': persistent_size,
+            }
+
+
+_score_cache = None
+_score_cache_lock = threading.Lock()
+
+
+def get_score_cache() -> ScoreCache:
+    # erst beim ersten Zugriff anlegen, damit der Import keine Datei erzeugt
+    global _score_cache
+    with _score_cache_lock:
+        if _score_cache is None:
+            _score_cache = ScoreCache(
+                path=config.SCORE_CACHE_PATH,
+                memory_size=config.SCORE_CACHE_MEMORY_SIZE,
+                ttl_seconds=config.SCORE_CACHE_TTL_SECONDS,
+                max_entries=config.SCORE_CACHE_MAX_ENTRIES,
+            )
+        return _score_cache
@@ -0,0 +1,90 @@
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from src.server.core import config
+from src.server.core.metrics import QUEUE_DEPTH
+
+
+class QueueFullError(RuntimeError):
+    pass
+
+
+class ScoringJobQueue:
+    """
+    Begrenzter Thread-Pool für LLM-Scoring. submit() kehrt sofort mit einer
+    Job-ID zurück; der Worker schreibt Session und Lernfortschritt. Der
+    Job-Status steht in der DB (Scoring_Jobs), damit jeder Server-Worker
+    die Abfrage beantworten kann.
+    """
+
+    def __init__(self, max_workers, max_pending):
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="scoring")
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._active = 0  # Jobs dieses Prozesses in Warteschlange + in Arbeit
+        self._lock = threading.Lock()
+
+    def submit(self, app, llm, user_id, sentence_id, to_translate, translations, references=None) -> str:
+        if not self._slots.acquire(blocking=False):
+            raise QueueFullError("Scoring queue is full")
+
+        job_id = uuid.uuid4().hex
+        try:
+            # alte Jobs räumt der Purge-Thread ab (DataManager.start_purge_worker)
+            app.manager.create_scoring_job(job_id, user_id, sentence_id)
+            with self._lock:
+                self._active += 1
+            self._executor.submit(
+                self._run, job_id, app, llm, user_id, sentence_id, to_translate, translations, references
+            )
+        except Exception:
+            self._slots.release()
+            raise
+        return job_id
+
+    def _run(self, job_id, app, llm, user_id, sentence_id, to_translate, translations, references):
+        try:
+            with app.app_context():
+                app.manager.update_scoring_job(job_id, status='running')
+                try:
+                    score = llm.score_answer(to_translate, translations, references) / 100
+                    session = app.manager.record_review(
+                        user_id, sentence_id, {'translations': llm.normalize_translations(translations)}, score
+                    )
+                    app.manager.update_scoring_job(
+                        job_id, status='done', score=score, session_id=session.id, finished_at=datetime.utcnow()
+                    )
+                except Exception as e:
+                    app.manager.db.session.rollback()
+                    app.manager.update_scoring_job(
+                        job_id, status='failed', error=str(e)[:500], finished_at=datetime.utcnow()
+                    )
+        except Exception as e:
+            print(f"Warning: scoring job {job_id} failed: {e}")
+        finally:
+            with self._lock:
+                self._active -= 1
+            self._slots.release()
+
+    def depth(self) -> int:
+        with self._lock:
+            return self._active
+
+
+_scoring_queue = None
+_scoring_queue_lock = threading.Lock()
+
+
+def get_scoring_queue() -> ScoringJobQueue:
+    # Thread-Pool erst beim ersten Job starten
+    global _scoring_queue
+    with _scoring_queue_lock:
+        if _scoring_queue is None:
+            _scoring_queue = ScoringJobQueue(
+                max_workers=config.SCORING_WORKERS,
+                max_pending=config.SCORING_MAX_PENDING,
+            )
+            QUEUE_DEPTH.set_function(_scoring_queue.depth, queue="scoring_jobs")
+        return _scoring_queue
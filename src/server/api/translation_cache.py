@@ -0,0 +1,120 @@
+import threading
+from collections import OrderedDict
+
+from src.server.core import config
+
+
+class TranslationCache:
+    """
+    Globaler Cache für Referenzübersetzungen über alle User hinweg.
+    Key: (source_hash, target_language, model) - source_hash deckt den
+    normalisierten Quelltext und die Quellsprache ab.
+    Jeder Eintrag zählt, wie viele gespeicherte Sätze ihn verwenden;
+    verdrängt werden zuerst unreferenzierte Einträge (LRU).
+    """
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> [translated_text, refcount]
+        self._unreferenced = OrderedDict()  # Keys mit refcount 0, zuletzt benutzt/freigegeben am Ende
+        self._lock = threading.Lock()
+
+        self.memory_hits = 0
+        self.persistent_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, loader=None, count_miss=True):
+        """
+        loader(key) -> (translated_text, refcount) oder None lädt bei einem
+        Miss aus der translations-Tabelle nach (außerhalb des Locks).
+        count_miss=False für Vorab-Lookups, denen noch ein zweiter folgt.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._touch(key, entry)
+                self.memory_hits += 1
+                return entry[0]
+
+        loaded = loader(key) if loader else None
+        with self._lock:
+            if loaded is None:
+                self.misses += count_miss
+                return None
+            self.persistent_hits += 1
+        self.put(key, *loaded)
+        return loaded[0]
+
+    def put(self, key, translated_text, refcount=0):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = [translated_text, refcount]
+            else:
+                entry[0] = translated_text
+                entry[1] = max(entry[1], refcount)
+            self._touch(key, entry)
+            self._evict()
+
+    def incref(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry[1] += 1
+                self._unreferenced.pop(key, None)
+
+    def decref(self, key, count=1):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry[1] = max(0, entry[1] - count)
+                if entry[1] == 0:
+                    self._unreferenced[key] = None
+
+    def _touch(self, key, entry):
+        self._entries.move_to_end(key)
+        if entry[1] == 0:
+            self._unreferenced[key] = None
+            self._unreferenced.move_to_end(key)
+        else:
+            self._unreferenced.pop(key, None)
+
+    def _evict(self):
+        # erst unreferenzierte Einträge, ältester zuerst (O(1) pro Eintrag)
+        while len(self._entries) > self.max_entries and self._unreferenced:
+            key, _ = self._unreferenced.popitem(last=False)
+            del self._entries[key]
+            self.evictions += 1
+        # dann reines LRU; die Übersetzung bleibt in der DB und wird bei Bedarf nachgeladen
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            hits = self.memory_hits + self.persistent_hits
+            lookups = hits + self.misses
+            return {
+                'hits': hits,
+                'memory_hits': self.memory_hits,
+                'persistent_hits': self.persistent_hits,
+                'misses': self.misses,
+                'hit_ratio': hits / lookups if lookups else 0.0,
+                'llm_calls_saved': hits,
+                'size': len(self._entries),
+                'referenced': len(self._entries) - len(self._unreferenced),
+                'evictions': self.evictions,
+            }
+
+
+_translation_cache = None
+_translation_cache_lock = threading.Lock()
+
+
+def get_translation_cache() -> TranslationCache:
+    global _translation_cache
+    with _translation_cache_lock:
+        if _translation_cache is None:
+            _translation_cache = TranslationCache(config.TRANSLATION_CACHE_MAX_ENTRIES)
+        return _translation_cache
@@ -0,0 +1,63 @@
+import hashlib
+import threading
+import unicodedata
+from concurrent.futures import ThreadPoolExecutor
+
+from src.server.core import config
+from src.server.core.metrics import QUEUE_DEPTH
+
+
+def source_hash(text, source_language) -> str:
+    # gleicher Satz (bis auf Groß-/Kleinschreibung und Leerzeichen) -> gleicher Hash
+    normalized = " ".join(unicodedata.normalize("NFC", text).casefold().split())
+    return hashlib.sha256(f"{source_language}\n{normalized}".encode("utf-8")).hexdigest()
+
+
+class TranslationPipeline:
+    """
+    Erzeugt im Hintergrund die Referenzübersetzungen eines neuen Satzes
+    (ein LLM-Aufruf pro Zielsprache) und speichert sie in translations.
+    """
+
+    def __init__(self, max_workers):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="translation")
+        self._key_locks = [threading.Lock() for _ in range(64)]
+        self._lock = threading.Lock()
+        self._pending = 0
+
+    def submit(self, app, sentence_id):
+        with self._lock:
+            self._pending += 1
+        return self._executor.submit(self._run, app, sentence_id)
+
+    def _run(self, app, sentence_id):
+        try:
+            with app.app_context():
+                app.manager.translate_sentence(sentence_id, key_lock=self.key_lock)
+        except Exception as e:
+            print(f"Warning: translating sentence {sentence_id} failed: {e}")
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    def key_lock(self, key):
+        # gleiche (Quelltext, Zielsprache) nicht parallel übersetzen, auch nicht
+        # von anderen Aufrufern von translate_sentence (z.B. Prefetch)
+        return self._key_locks[hash(key) % len(self._key_locks)]
+
+    def depth(self) -> int:
+        with self._lock:
+            return self._pending
+
+
+_translation_pipeline = None
+_translation_pipeline_lock = threading.Lock()
+
+
+def get_translation_pipeline() -> TranslationPipeline:
+    global _translation_pipeline
+    with _translation_pipeline_lock:
+        if _translation_pipeline is None:
+            _translation_pipeline = TranslationPipeline(config.TRANSLATION_WORKERS)
+            QUEUE_DEPTH.set_function(_translation_pipeline.depth, queue="translation_pipeline")
+        return _translation_pipeline
@@ -0,0 +1,79 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional, Tuple
+
+from src.server.core import config
+
+
+@dataclass(frozen=True)
+class UserProfile:
+    # unveränderlicher Snapshot, kann ohne DB-Session zwischen Requests geteilt werden
+    id: int
+    username: str
+    native_language: str
+    created_at: Optional[datetime]
+    target_languages: Tuple[str, ...]
+
+
+class UserProfileCache:
+    """
+    Prozessweiter LRU-Cache für User-Profile (User + Zielsprachen) mit TTL.
+    Schreibzugriffe im DataManager invalidieren; die TTL begrenzt, wie
+    lange andere Server-Worker eine alte Version sehen.
+    """
+
+    def __init__(self, max_entries, ttl_seconds):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()  # user_id -> (profile, expires_at)
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, user_id):
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None or entry[1] < time.monotonic():
+                self._entries.pop(user_id, None)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(user_id)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, user_id, profile):
+        with self._lock:
+            self._entries[user_id] = (profile, time.monotonic() + self.ttl_seconds)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': self.hits / lookups if lookups else 0.0,
+                'size': len(self._entries),
+            }
+
+
+_user_cache = None
+_user_cache_lock = threading.Lock()
+
+
+def get_user_cache() -> UserProfileCache:
+    global _user_cache
+    with _user_cache_lock:
+        if _user_cache is None:
+            _user_cache = UserProfileCache(config.USER_CACHE_MAX_ENTRIES, config.USER_CACHE_TTL_SECONDS)
+        return _user_cache
@@ -0,0 +1,133 @@
+import os
+from dotenv import load_dotenv
+
+load_dotenv()  # Lädt .env Datei
+
+
+# ------------------- SCORE CACHE -------------------
+SCORE_CACHE_PATH = os.getenv("SCORE_CACHE_PATH", "score_cache.db")
+SCORE_CACHE_MEMORY_SIZE = int(os.getenv("SCORE_CACHE_MEMORY_SIZE", "2048"))
+SCORE_CACHE_TTL_SECONDS = int(os.getenv("SCORE_CACHE_TTL_SECONDS", str(30 * 24 * 3600)))
+SCORE_CACHE_MAX_ENTRIES = int(os.getenv("SCORE_CACHE_MAX_ENTRIES", "200000"))
+
+
+# ------------------- PRE-SCORER -------------------
+PRESCORE_ENABLED = os.getenv("PRESCORE_ENABLED", "true").lower() == "true"
+# Ähnlichkeit (0-1) ab der eine Antwort ohne LLM als richtig gilt
+PRESCORE_ACCEPT_THRESHOLD = float(os.getenv("PRESCORE_ACCEPT_THRESHOLD", "0.92"))
+# Ähnlichkeit (0-1) unter der eine Antwort ohne LLM als falsch gilt; 0 = aus,
+# denn richtige Synonyme ("car" / "automobile") sind der Referenz oft kaum ähnlich
+PRESCORE_REJECT_THRESHOLD = float(os.getenv("PRESCORE_REJECT_THRESHOLD", "0"))
+# Score für Antworten, die sich nur in Akzenten/Diakritika unterscheiden
+PRESCORE_DIACRITICS_SCORE = int(os.getenv("PRESCORE_DIACRITICS_SCORE", "85"))
+
+
+# ------------------- REVIEW / ASYNC SCORING -------------------
+# Score (0-1) ab dem eine Review als erfolgreich zählt
+REVIEW_SUCCESS_THRESHOLD = float(os.getenv("REVIEW_SUCCESS_THRESHOLD", "0.7"))
+SCORING_WORKERS = int(os.getenv("SCORING_WORKERS", "4"))
+# max. Jobs in Warteschlange + in Arbeit, danach 503 (Backpressure)
+SCORING_MAX_PENDING = int(os.getenv("SCORING_MAX_PENDING", "64"))
+# Job-Status wird so lange aufbewahrt (gelöscht im Purge-Thread, alle USER_PURGE_INTERVAL_SECONDS)
+SCORING_JOB_TTL_SECONDS = int(os.getenv("SCORING_JOB_TTL_SECONDS", "3600"))
+
+
+# ------------------- LLM LOADING -------------------
+# GGUF per mmap laden: Seiten werden geteilt und erst bei Bedarf eingelesen
+LLM_USE_MMAP = os.getenv("LLM_USE_MMAP", "true").lower() == "true"
+LLM_USE_MLOCK = os.getenv("LLM_USE_MLOCK", "false").lower() == "true"
+LLM_N_CTX = int(os.getenv("LLM_N_CTX", "2048"))
+# Modell beim App-Start laden und einen Probe-Token erzeugen
+LLM_WARMUP = os.getenv("LLM_WARMUP", "false").lower() == "true"
+# Anzahl llama.cpp-Worker-Prozesse; 0 = Modell im Webprozess (ein Aufruf gleichzeitig)
+LLM_LOCAL_WORKERS = int(os.getenv("LLM_LOCAL_WORKERS", "0"))
+# max. Prompts in Warteschlange + in Arbeit im Worker-Pool
+LLM_LOCAL_QUEUE_SIZE = int(os.getenv("LLM_LOCAL_QUEUE_SIZE", "64"))
+LLM_LOCAL_TIMEOUT_SECONDS = float(os.getenv("LLM_LOCAL_TIMEOUT_SECONDS", "120"))
+# KV-State für feste Prompt-Prefixe (Anweisung, Ausgangssatz) wiederverwenden
+LLM_PREFIX_CACHE_ENABLED = os.getenv("LLM_PREFIX_CACHE_ENABLED", "true").lower() == "true"
+# pro Prozess (Webprozess und jeder Pool-Worker); ein State kostet zig MB
+LLM_PREFIX_CACHE_STATES = int(os.getenv("LLM_PREFIX_CACHE_STATES", "8"))
+LLM_PREFIX_CACHE_MAX_MB = int(os.getenv("LLM_PREFIX_CACHE_MAX_MB", "256"))
+# Länge des gestreamten Feedbacks (/api/evaluate/stream)
+LLM_FEEDBACK_MAX_TOKENS = int(os.getenv("LLM_FEEDBACK_MAX_TOKENS", "96"))
+
+
+# ------------------- USER DELETION -------------------
+# Default für ?soft: DELETE /api/users/<id> markiert nur und ein Hintergrund-Thread löscht später
+USER_SOFT_DELETE = os.getenv("USER_SOFT_DELETE", "false").lower() == "true"
+USER_PURGE_INTERVAL_SECONDS = int(os.getenv("USER_PURGE_INTERVAL_SECONDS", "300"))
+
+
+# ------------------- SCHEDULER -------------------
+SCHEDULER_ALGORITHM = os.getenv("SCHEDULER_ALGORITHM", "sm2")  # sm2 | fsrs
+SCHEDULER_MAX_INTERVAL_DAYS = int(os.getenv("SCHEDULER_MAX_INTERVAL_DAYS", "365"))
+SM2_INTERVAL_MODIFIER = float(os.getenv("SM2_INTERVAL_MODIFIER", "1.0"))
+FSRS_REQUEST_RETENTION = float(os.getenv("FSRS_REQUEST_RETENTION", "0.9"))
+
+
+# ------------------- TRANSLATIONS -------------------
+# Referenzübersetzungen beim Anlegen eines Satzes im Hintergrund erzeugen
+TRANSLATION_PIPELINE_ENABLED = os.getenv("TRANSLATION_PIPELINE_ENABLED", "true").lower() == "true"
+TRANSLATION_WORKERS = int(os.getenv("TRANSLATION_WORKERS", "2"))
+# globaler Übersetzungs-Cache (alle User), Anzahl Einträge im Speicher
+TRANSLATION_CACHE_MAX_ENTRIES = int(os.getenv("TRANSLATION_CACHE_MAX_ENTRIES", "20000"))
+
+
+# ------------------- USER PROFILE CACHE -------------------
+# User + Zielsprachen zwischen Requests cachen; TTL = max. Verzögerung in anderen Workern
+USER_CACHE_TTL_SECONDS = int(os.getenv("USER_CACHE_TTL_SECONDS", "60"))
+USER_CACHE_MAX_ENTRIES = int(os.getenv("USER_CACHE_MAX_ENTRIES", "10000"))
+
+
+# ------------------- REVIEW QUEUE -------------------
+# nächste fällige Karten pro User im Speicher, nachladen unter LOW_WATERMARK
+REVIEW_QUEUE_SIZE = int(os.getenv("REVIEW_QUEUE_SIZE", "20"))
+REVIEW_QUEUE_LOW_WATERMARK = int(os.getenv("REVIEW_QUEUE_LOW_WATERMARK", "5"))
+REVIEW_QUEUE_TTL_SECONDS = int(os.getenv("REVIEW_QUEUE_TTL_SECONDS", "300"))
+# wie lange "keine Karte fällig" gilt, bevor wieder nachgesehen wird
+REVIEW_QUEUE_EMPTY_TTL_SECONDS = int(os.getenv("REVIEW_QUEUE_EMPTY_TTL_SECONDS", "30"))
+REVIEW_QUEUE_MAX_USERS = int(os.getenv("REVIEW_QUEUE_MAX_USERS", "5000"))
+REVIEW_QUEUE_WORKERS = int(os.getenv("REVIEW_QUEUE_WORKERS", "2"))
+
+
+# ------------------- PREFETCH -------------------
+# nächste Karten vorbereiten, während der Lernende tippt (Referenzen + KV-State);
+# LLM_PREFIX_CACHE_STATES sollte größer als PREFETCH_DEPTH sein
+PREFETCH_ENABLED = os.getenv("PREFETCH_ENABLED", "true").lower() == "true"
+PREFETCH_DEPTH = int(os.getenv("PREFETCH_DEPTH", "3"))
+
+
+# ------------------- DATABASE -------------------
+SQLALCHEMY_DATABASE_URI = os.getenv("SQLALCHEMY_DATABASE_URI", "sqlite:///app.db")
+# Verbindungen pro Prozess (jeder Server-Worker hat seinen eigenen Pool):
+# eine pro Request-Thread plus eine pro Hintergrund-Thread (Scoring, Übersetzungen,
+# Review-Queue, Prefetch, Purge); bei Postgres zählt workers * (size + overflow) gegen max_connections
+DB_BACKGROUND_THREADS = SCORING_WORKERS + TRANSLATION_WORKERS + REVIEW_QUEUE_WORKERS + 2
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", str(int(os.getenv("SERVER_THREADS", "4")) + DB_BACKGROUND_THREADS)))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "4"))
+DB_POOL_TIMEOUT_SECONDS = int(os.getenv("DB_POOL_TIMEOUT_SECONDS", "30"))
+# Verbindungen vor Server-seitigen Idle-Timeouts erneuern (Postgres)
+DB_POOL_RECYCLE_SECONDS = int(os.getenv("DB_POOL_RECYCLE_SECONDS", "1800"))
+
+# SQLite: WAL erlaubt Lesen während geschrieben wird, NORMAL spart den fsync pro Commit
+SQLITE_WAL = os.getenv("SQLITE_WAL", "true").lower() == "true"
+SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+# so lange auf den Schreib-Lock warten statt "database is locked"
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+SQLITE_CACHE_SIZE_KB = int(os.getenv("SQLITE_CACHE_SIZE_KB", str(64 * 1024)))
+
+
+# ------------------- SERVER -------------------
+# Produktivbetrieb über src/server/wsgi.py (gunicorn)
+SERVER_HOST = os.getenv("SERVER_HOST", "0.0.0.0")
+SERVER_PORT = int(os.getenv("SERVER_PORT", "5002"))
+SERVER_WORKERS = int(os.getenv("SERVER_WORKERS", str(min(4, os.cpu_count() or 1))))
+SERVER_THREADS = int(os.getenv("SERVER_THREADS", "4"))
+SERVER_KEEPALIVE_SECONDS = int(os.getenv("SERVER_KEEPALIVE_SECONDS", "5"))
+SERVER_TIMEOUT_SECONDS = int(os.getenv("SERVER_TIMEOUT_SECONDS", "120"))
+# Zeit, die laufende Requests beim Herunterfahren noch bekommen
+SERVER_GRACEFUL_TIMEOUT_SECONDS = int(os.getenv("SERVER_GRACEFUL_TIMEOUT_SECONDS", "30"))
+# App im Master laden (Copy-on-Write); das Modell lädt jeder Worker selbst
+SERVER_PRELOAD = os.getenv("SERVER_PRELOAD", "true").lower() == "true"
@@ -0,0 +1,232 @@
+import bisect
+import functools
+import threading
+import time
+
+from flask import Response, g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+# Sekunden: von einzelnen Queries bis zu langen lokalen LLM-Aufrufen
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 250, 1000, 4000)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self._samples())
+        return lines
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name, documentation, labelnames=()):
+        super().__init__(name, documentation, labelnames)
+        self._values = {}
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def _samples(self):
+        with self._lock:
+            items = list(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {value}" for key, value in items]
+
+
+class Gauge(_Metric):
+    """Wert wird erst beim Abruf von /metrics über die registrierten Funktionen gelesen."""
+    kind = "gauge"
+
+    def __init__(self, name, documentation, labelnames=()):
+        super().__init__(name, documentation, labelnames)
+        self._functions = {}
+
+    def set_function(self, function, **labels):
+        with self._lock:
+            self._functions[self._key(labels)] = function
+
+    def _samples(self):
+        with self._lock:
+            items = list(self._functions.items())
+        samples = []
+        for key, function in items:
+            try:
+                samples.append(f"{self.name}{_format_labels(self.labelnames, key)} {function()}")
+            except Exception:
+                continue
+        return samples
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+        self._values = {}  # key -> [bucket counts..., sum, count]
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [0] * (len(self.buckets) + 2)
+            if index < len(self.buckets):
+                state[index] += 1
+            state[-2] += value
+            state[-1] += 1
+
+    def time(self, **labels):
+        return _Timer(self, labels)
+
+    def _samples(self):
+        with self._lock:
+            items = [(key, list(state)) for key, state in self._values.items()]
+        samples = []
+        for key, state in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets, state):
+                cumulative += count
+                samples.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, [('le', bound)])} {cumulative}")
+            samples.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, [('le', '+Inf')])} {state[-1]}")
+            samples.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {state[-2]}")
+            samples.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {state[-1]}")
+        return samples
+
+
+class _Timer:
+    def __init__(self, histogram, labels):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self.start, **self.labels)
+
+    def __call__(self, function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            # eigener Timer pro Aufruf, der Decorator wird von mehreren Threads geteilt
+            with _Timer(self.histogram, self.labels):
+                return function(*args, **kwargs)
+        return wrapper
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name, documentation, labelnames, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, documentation, labelnames, **kwargs)
+            return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        return self._get_or_create(Counter, name, documentation, labelnames)
+
+    def gauge(self, name, documentation, labelnames=()):
+        return self._get_or_create(Gauge, name, documentation, labelnames)
+
+    def histogram(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        return self._get_or_create(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+HTTP_REQUEST_SECONDS = REGISTRY.histogram(
+    "http_request_duration_seconds", "Request latency per endpoint", ("endpoint", "method", "status")
+)
+DB_QUERIES_PER_REQUEST = REGISTRY.histogram(
+    "db_queries_per_request", "SQL statements executed per request", ("endpoint",), buckets=COUNT_BUCKETS
+)
+DB_QUERIES_TOTAL = REGISTRY.counter("db_queries_total", "SQL statements executed")
+DB_COMMIT_SECONDS = REGISTRY.histogram("db_commit_duration_seconds", "DataManager._commit duration")
+LLM_REQUEST_SECONDS = REGISTRY.histogram(
+    "llm_request_duration_seconds", "LLM completion latency", ("provider", "kind")
+)
+LLM_SCORE_SECONDS = REGISTRY.histogram(
+    "llm_score_duration_seconds", "score_answer latency by where the score came from",
+    ("provider", "source")  # source: prescorer | cache | llm
+)
+LLM_TOKENS = REGISTRY.histogram(
+    "llm_tokens", "Tokens per LLM completion", ("provider", "type"), buckets=COUNT_BUCKETS
+)
+QUEUE_DEPTH = REGISTRY.gauge("queue_depth", "Pending items per background queue", ("queue",))
+
+
+def timed(histogram, **labels):
+    """Decorator: Laufzeit der Funktion in histogram erfassen."""
+    return histogram.time(**labels)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _count_query(conn, cursor, statement, parameters, context, executemany):
+    DB_QUERIES_TOTAL.inc()
+    if has_request_context():
+        g.metrics_queries = g.get("metrics_queries", 0) + 1
+
+
+def init_metrics(app):
+    """Hooks für Latenz und Query-Anzahl pro Endpoint plus GET /metrics."""
+
+    @app.before_request
+    def _start_timer():
+        g.metrics_start = time.perf_counter()
+        g.metrics_queries = 0
+
+    @app.after_request
+    def _observe_request(response):
+        start = g.pop("metrics_start", None)
+        if start is not None and request.endpoint != "metrics":
+            endpoint = request.endpoint or "unmatched"
+            HTTP_REQUEST_SECONDS.observe(
+                time.perf_counter() - start, endpoint=endpoint, method=request.method, status=response.status_code
+            )
+            DB_QUERIES_PER_REQUEST.observe(g.get("metrics_queries", 0), endpoint=endpoint)
+        return response
+
+    @app.route("/metrics")
+    def metrics():
+        return Response(REGISTRY.render(), mimetype="text/plain; version=0.0.4")
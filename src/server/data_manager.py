@@ -1,18 +1,36 @@
-from sqlalchemy import and_, func
+from sqlalchemy import and_, func, insert, update, select
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, date, timezone
+from contextlib import nullcontext
+import threading
+from flask import current_app, g, has_app_context
+from pydantic import ValidationError
 from src.server.extensions import db
 from src.server.models.data_models import (
-    User, User_Languages, Sentences, Sessions
+    User, User_Languages, Sentences, Sessions, User_Stats, User_Stats_Buckets, Translations, Scoring_Jobs
 )
-from src.server.api.llm_adapter import LLMAdapter
+from src.server.models.api import SentenceCreateRequest
+from src.server.api.llm_adapter import get_llm_adapter
+from src.server.scheduler import get_scheduler
+from src.server.api.translation_pipeline import get_translation_pipeline, source_hash
+from src.server.api.translation_cache import get_translation_cache
+from src.server.api.user_cache import UserProfile, get_user_cache
+from src.server.api.review_queue import ReviewCard, get_review_queue
+from src.server.core import config
+from src.server.core.metrics import DB_COMMIT_SECONDS, timed
+import numpy as np
 
 
 class DataManager:
     def __init__(self):
         self.db = db
-        self.llm = LLMAdapter()
 
+    @property
+    def llm(self):
+        # shared, lazily loaded adapter instead of one model per DataManager
+        return get_llm_adapter()
+
+    @timed(DB_COMMIT_SECONDS)
     def _commit(self):
         try:
             self.db.session.commit()
@@ -22,18 +40,24 @@ class DataManager:
 
     # User Management
     def create_user(self, username, native_language):
-        if User.query.filter_by(username=username).first():
+        existing = User.query.filter_by(username=username).first()
+        if existing and existing.deleted_at is None:
             raise ValueError("Username already exists")
+        if existing:
+            # soft-deleted and not purged yet: free the (unique) username now
+            self._purge_user(existing.id)
+            self._invalidate_user_profile(existing.id)
         user = User(username=username, native_language=native_language, created_at=datetime.utcnow())
         self.db.session.add(user)
         self._commit()
         return user
 
     def get_user_by_id(self, user_id):
-        return User.query.get(user_id)
+        user = self.db.session.get(User, user_id)
+        return user if user and user.deleted_at is None else None
 
     def get_user_by_username(self, username):
-        return User.query.filter_by(username=username).first()
+        return User.query.filter_by(username=username, deleted_at=None).first()
 
     # get all users for test reasons
     def get_users(self):
@@ -45,6 +69,49 @@ class DataManager:
             'created_at': user.created_at.isoformat() if user.created_at else None
         } for user in users]
 
+    def get_user_profile(self, user_id):
+        """
+        Read-only UserProfile (user + target language codes) for page views:
+        memoized for the current request in flask.g, then served from the
+        process-wide TTL cache, otherwise loaded with a single query.
+        """
+        memo = g.setdefault('user_profiles', {}) if has_app_context() else {}
+        if user_id in memo:
+            return memo[user_id]
+
+        profile = get_user_cache().get(user_id)
+        if profile is None:
+            profile = self._load_user_profile(user_id)
+            if profile is not None:
+                get_user_cache().set(user_id, profile)
+        memo[user_id] = profile
+        return profile
+
+    def _load_user_profile(self, user_id):
+        rows = self.db.session.execute(
+            select(User.id, User.username, User.native_language, User.created_at, User_Languages.language_code)
+            .outerjoin(User_Languages, User_Languages.user_id == User.id)
+            .where(User.id == user_id, User.deleted_at.is_(None))
+            .order_by(User_Languages.id)
+        ).all()
+        if not rows:
+            return None
+        user_id, username, native_language, created_at, _ = rows[0]
+        return UserProfile(
+            id=user_id,
+            username=username,
+            native_language=native_language,
+            created_at=created_at,
+            target_languages=tuple(row.language_code for row in rows if row.language_code)
+        )
+
+    def _invalidate_user_profile(self, user_id):
+        get_user_cache().invalidate(user_id)
+        # queued cards carry the target languages
+        get_review_queue().invalidate(user_id)
+        if has_app_context():
+            g.setdefault('user_profiles', {}).pop(user_id, None)
+
     def add_target_language(self, user_id, language_code):
         if not self.get_user_by_id(user_id):
             raise ValueError("User not found")
@@ -53,8 +120,17 @@ class DataManager:
         lang = User_Languages(user_id=user_id, language_code=language_code, created_at=datetime.utcnow())
         self.db.session.add(lang)
         self._commit()
+        self._invalidate_user_profile(user_id)
         return lang
 
+    def delete_user_language(self, user_id, language_code):
+        deleted = User_Languages.query.filter_by(user_id=user_id, language_code=language_code).delete()
+        if not deleted:
+            return False
+        self._commit()
+        self._invalidate_user_profile(user_id)
+        return True
+
     def get_user_languages(self, user_id):
         return User_Languages.query.filter_by(user_id=user_id).all()
 
@@ -63,8 +139,95 @@ class DataManager:
     def add_sentence_with_translations(self, user_id, original_text, category=None):
         # Create sentence with default progress values
         sentence = self.create_sentence(user_id, original_text, category)
+        # reference translations are generated in the background, off the request path
+        if config.TRANSLATION_PIPELINE_ENABLED:
+            get_translation_pipeline().submit(current_app._get_current_object(), sentence.id)
         return sentence
 
+    def translate_sentence(self, sentence_id, key_lock=None):
+        """
+        Stores a reference translation for every target language of the
+        sentence's owner that doesn't have one yet. Identical source texts
+        (of any user) reuse an existing translation instead of calling the LLM.
+        """
+        sentence = self.get_sentence_by_id(sentence_id)
+        profile = sentence and self.get_user_profile(sentence.user_id)
+        if not profile:
+            return {}
+
+        original_text, language_code = sentence.original_text, sentence.language_code
+        src_hash = source_hash(original_text, language_code)
+        translations = self.get_translations(sentence_id)
+        for code in profile.target_languages:
+            if code in translations:
+                continue
+            key = self._translation_key(src_hash, code)
+            with key_lock(key) if key_lock else nullcontext():
+                text = get_translation_cache().get(key, loader=self._load_translation)
+                if text is None:
+                    # end the read transaction: no pooled connection is held during the LLM call
+                    self.db.session.commit()
+                    text = self.llm.translate(original_text, language_code, code)
+                    get_translation_cache().put(key, text)
+                self.db.session.add(self._new_translation(sentence_id, key, text))
+                try:
+                    self._commit()
+                except IntegrityError:
+                    # stored concurrently for the same sentence (same key -> same text)
+                    pass
+                else:
+                    get_translation_cache().incref(key)
+            translations[code] = text
+        return translations
+
+    def _translation_key(self, src_hash, target_language):
+        # translations of different models are not interchangeable
+        return (src_hash, target_language, self.llm.model)
+
+    def _new_translation(self, sentence_id, key, translated_text):
+        src_hash, target_language, model = key
+        return Translations(
+            sentence_id=sentence_id,
+            target_language=target_language,
+            translated_text=translated_text,
+            source_hash=src_hash,
+            model=model,
+            created_at=datetime.utcnow()
+        )
+
+    def _load_translation(self, key):
+        # cache miss: an identical sentence of any user may already be translated
+        src_hash, target_language, model = key
+        row = self.db.session.execute(
+            select(Translations.translated_text, func.count())
+            .where(
+                Translations.source_hash == src_hash,
+                Translations.target_language == target_language,
+                Translations.model == model
+            )
+            .group_by(Translations.translated_text)
+            .limit(1)
+        ).first()
+        return tuple(row) if row else None
+
+    def _release_translations(self, condition):
+        # drop the cache references of translations that are about to be deleted
+        rows = self.db.session.execute(
+            select(Translations.source_hash, Translations.target_language, Translations.model, func.count())
+            .where(condition)
+            .group_by(Translations.source_hash, Translations.target_language, Translations.model)
+        )
+        for src_hash, target_language, model, count in rows:
+            get_translation_cache().decref((src_hash, target_language, model), count)
+
+    def get_translations(self, sentence_id):
+        return {
+            target_language: translated_text
+            for target_language, translated_text in self.db.session.query(
+                Translations.target_language, Translations.translated_text
+            ).filter(Translations.sentence_id == sentence_id)
+        }
+
 
 
     def get_user_categories(self, user_id):
@@ -73,7 +236,7 @@ class DataManager:
         return [category[0] for category in categories if category[0]]
 
     def create_sentence(self, user_id, original_text, category=None):
-        user = self.get_user_by_id(user_id)
+        user = self.get_user_profile(user_id)
         if not user:
             raise ValueError("User not found")
         sentence = Sentences(
@@ -87,63 +250,321 @@ class DataManager:
             review_count=0,
             created_at=datetime.utcnow()
         )
+        self._ensure_stats(user_id)
         self.db.session.add(sentence)
+        self._bump_stats(user_id, total_sentences=1)
+        self._bump_bucket(user_id, 'category', category, count=1)
+
+        self.db.session.flush()
+        cached_keys, _ = self._add_cached_translations(
+            [(sentence.id, original_text, sentence.language_code)], user.target_languages
+        )
+
         self._commit()
+        for key in cached_keys:
+            get_translation_cache().incref(key)
+        get_review_queue().card_added(user_id)
         return sentence
 
+    def _add_cached_translations(self, sentences, target_languages):
+        """
+        Common phrases are usually translated already: adds the translations
+        the global translation cache knows for sentences ([(id, text, language_code)]),
+        only the rest goes to the LLM later. Returns the cache keys to incref
+        after the commit and the ids still missing a target language.
+        """
+        cached_keys = []
+        missing_ids = []
+        for sentence_id, original_text, language_code in sentences:
+            src_hash = source_hash(original_text, language_code)
+            missing = False
+            for target_language in target_languages:
+                key = self._translation_key(src_hash, target_language)
+                # a miss is counted once, by the pipeline that then calls the LLM
+                text = get_translation_cache().get(key, loader=self._load_translation, count_miss=False)
+                if text is None:
+                    missing = True
+                    continue
+                self.db.session.add(self._new_translation(sentence_id, key, text))
+                cached_keys.append(key)
+            if missing:
+                missing_ids.append(sentence_id)
+        return cached_keys, missing_ids
+
+    def bulk_create_sentences(self, user_id, rows, chunk_size=500):
+        """
+        Imports many sentences for one user. rows is any iterable of dicts
+        (can be a generator over a streamed upload). Valid rows are inserted
+        in chunks of chunk_size with one executemany + commit per chunk;
+        invalid rows are reported and skipped.
+        """
+        user = self.get_user_profile(user_id)
+        if not user:
+            raise ValueError("User not found")
+
+        created = 0
+        errors = []
+        chunk = []
+        now = datetime.utcnow()
+
+        for index, row in enumerate(rows):
+            try:
+                if not isinstance(row, dict):
+                    raise ValueError("Row must be an object")
+                sentence_request = SentenceCreateRequest(**{**row, 'user_id': user_id})
+            except (ValidationError, ValueError, TypeError) as e:
+                details = e.errors() if isinstance(e, ValidationError) else str(e)
+                errors.append({'row': index, 'error': details})
+                continue
+
+            chunk.append({
+                'user_id': user_id,
+                'original_text': sentence_request.original_text,
+                'language_code': user.native_language,
+                'category': sentence_request.category or None,
+                'score': 0.0,
+                'last_review': None,
+                'next_review': now,
+                'review_count': 0,
+                'created_at': now
+            })
+            if len(chunk) >= chunk_size:
+                created += self._insert_sentence_chunk(user, chunk)
+                chunk = []
+
+        if chunk:
+            created += self._insert_sentence_chunk(user, chunk)
+
+        return {'created': created, 'failed': len(errors), 'errors': errors}
+
+    def _insert_sentence_chunk(self, user, chunk):
+        user_id = user.id
+        self._ensure_stats(user_id)
+        # executemany with RETURNING (insertmanyvalues): ids in row order
+        sentence_ids = self.db.session.scalars(
+            insert(Sentences).returning(Sentences.id, sort_by_parameter_order=True), chunk
+        ).all()
+        self._bump_stats(user_id, total_sentences=len(chunk))
+        per_category = {}
+        for row in chunk:
+            per_category[row['category']] = per_category.get(row['category'], 0) + 1
+        for category, count in per_category.items():
+            self._bump_bucket(user_id, 'category', category, count=count)
+        cached_keys, missing_ids = self._add_cached_translations(
+            [(sentence_id, row['original_text'], row['language_code']) for sentence_id, row in zip(sentence_ids, chunk)],
+            user.target_languages
+        )
+        self._commit()
+        for key in cached_keys:
+            get_translation_cache().incref(key)
+        # like add_sentence_with_translations: the rest is translated in the background
+        if config.TRANSLATION_PIPELINE_ENABLED:
+            for sentence_id in missing_ids:
+                get_translation_pipeline().submit(current_app._get_current_object(), sentence_id)
+        get_review_queue().card_added(user_id)
+        return len(chunk)
+
     def get_sentences_for_user(self, user_id):
         return Sentences.query.filter_by(user_id=user_id).all()
 
+    SENTENCE_FIELDS = (
+        'id', 'user_id', 'original_text', 'language_code', 'category', 'score',
+        'last_review', 'next_review', 'review_count', 'created_at'
+    )
+
+    def list_sentences(self, user_id, after_id=None, limit=100, category=None,
+                       due_before=None, min_score=None, max_score=None, fields=None):
+        """
+        One page of a user's sentences as plain dicts, ordered by id.
+        Keyset pagination: pass the last id of a page as after_id for the next one.
+        Returns (rows, next_after_id); next_after_id is None on the last page.
+        """
+        fields = [f for f in (fields or self.SENTENCE_FIELDS) if f in self.SENTENCE_FIELDS]
+        if 'id' not in fields:
+            fields.insert(0, 'id')
+        columns = [getattr(Sentences, f) for f in fields]
+
+        query = select(*columns).where(Sentences.user_id == user_id)
+        if after_id is not None:
+            query = query.where(Sentences.id > after_id)
+        if category is not None:
+            query = query.where(Sentences.category == category)
+        if due_before is not None:
+            query = query.where(Sentences.next_review <= due_before)
+        if min_score is not None:
+            query = query.where(Sentences.score >= min_score)
+        if max_score is not None:
+            query = query.where(Sentences.score <= max_score)
+        # one extra row tells us whether there is a next page
+        query = query.order_by(Sentences.id.asc()).limit(limit + 1)
+
+        rows = [self._row_to_dict(fields, values) for values in self.db.session.execute(query)]
+        next_after_id = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_after_id = rows[-1]['id']
+        return rows, next_after_id
+
+    @staticmethod
+    def _row_to_dict(fields, values):
+        return {
+            field: value.isoformat() if hasattr(value, 'isoformat') else value
+            for field, value in zip(fields, values)
+        }
+
     def get_sentences_by_category(self, user_id, category):
         return Sentences.query.filter_by(user_id=user_id, category=category).all()
 
     def delete_sentence(self, sentence_id):
         sentence = Sentences.query.get(sentence_id)
         if sentence:
-            # delete all dependent sessions
+            # take the sentence and its sessions out of the aggregates
+            self._ensure_stats(sentence.user_id)
+            removed_sessions = self._unrecord_sessions(sentence.user_id, Sessions.sentence_id == sentence_id)
+            self._bump_stats(sentence.user_id, total_sentences=-1, sentence_score_sum=-(sentence.score or 0.0))
+            self._bump_bucket(sentence.user_id, 'category', sentence.category, count=-1, score_sum=-(sentence.score or 0.0))
+
+            # delete all dependent rows, then the sentence (set-based statements)
             Sessions.query.filter_by(sentence_id=sentence_id).delete()
-            self.db.session.delete(sentence)
+            if removed_sessions:
+                # streaks can't be decremented: recompute them from the remaining review days
+                self._rebuild_streak(sentence.user_id, self.db.session.get(User_Stats, sentence.user_id))
+            self._release_translations(Translations.sentence_id == sentence_id)
+            Translations.query.filter_by(sentence_id=sentence_id).delete()
+            Sentences.query.filter_by(id=sentence_id).delete()
             self._commit()
+            get_review_queue().discard(sentence.user_id, sentence_id)
             return True
         return False
 
 
-    def delete_user(self, user_id):
-        user = User.query.get(user_id)
+    def delete_user(self, user_id, soft=False):
+        """
+        soft=True only marks the user as deleted (one UPDATE); the data is
+        removed later by purge_deleted_users.
+        """
+        user = self.get_user_by_id(user_id)
         if not user:
             return False
-        
-        # Delete all dependent data in correct order
-        # Sessions for user
-        Sessions.query.filter_by(user_id=user_id).delete()
-        
-        # User_Languages for user
-        User_Languages.query.filter_by(user_id=user_id).delete()
-        
-        # All sentences for user (sessions already deleted above)
-        user_sentences = Sentences.query.filter_by(user_id=user_id).all()
-        for sentence in user_sentences:
-            self.db.session.delete(sentence)
-        
-        # Delete user
-        self.db.session.delete(user)
+
+        if soft:
+            user.deleted_at = datetime.utcnow()
+        else:
+            self._purge_user(user_id)
         self._commit()
+        self._invalidate_user_profile(user_id)
         return True
+
+    def _purge_user(self, user_id):
+        # Children first with one DELETE per table, so this works whether or not
+        # the database already has the ON DELETE CASCADE foreign keys
+        user_translations = Translations.sentence_id.in_(select(Sentences.id).where(Sentences.user_id == user_id))
+        self._release_translations(user_translations)
+        Translations.query.filter(user_translations).delete(synchronize_session=False)
+        for model in (Scoring_Jobs, Sessions, Sentences, User_Languages, User_Stats_Buckets, User_Stats):
+            model.query.filter_by(user_id=user_id).delete()
+        User.query.filter_by(id=user_id).delete()
+
+    def purge_deleted_users(self, limit=100):
+        user_ids = [
+            user_id for (user_id,) in self.db.session.query(User.id)
+            .filter(User.deleted_at.isnot(None)).limit(limit)
+        ]
+        for user_id in user_ids:
+            self._purge_user(user_id)
+            self._commit()
+        return len(user_ids)
+
+    def start_purge_worker(self, app, interval_seconds):
+        def run():
+            stop = threading.Event()
+            while not stop.wait(interval_seconds):
+                try:
+                    with app.app_context():
+                        self.purge_deleted_users()
+                        # finished (or orphaned) async scoring jobs, off the request path
+                        self.purge_scoring_jobs(datetime.utcnow() - timedelta(seconds=config.SCORING_JOB_TTL_SECONDS))
+                except SQLAlchemyError as e:
+                    print(f"Warning: background purge failed: {e}")
+
+        thread = threading.Thread(target=run, name="user-purge", daemon=True)
+        thread.start()
+        return thread
             
 
     # Sessions Management
     def create_session(self, user_id, sentence_id, input_data=None, score=None):
+        self._ensure_stats(user_id)
+        session = self._add_session(user_id, sentence_id, input_data, score, datetime.utcnow())
+        self._commit()
+        return session
+
+    def _add_session(self, user_id, sentence_id, input_data, score, created_at):
         session = Sessions(
             user_id=user_id,
             sentence_id=sentence_id,
             input=input_data,
             score=score,
-            created_at=datetime.utcnow()
+            created_at=created_at
         )
         self.db.session.add(session)
-        self._commit()
+        self._record_session(user_id, input_data, score, created_at.date())
         return session
 
+    def record_review(self, user_id, sentence_id=None, input_data=None, score=None, reviews=None, batch_size=500):
+        """
+        Unit of work for a submitted answer: session, sentence progress and
+        aggregates are written in one transaction (one commit).
+
+        reviews: list of {'sentence_id', 'input', 'score', 'reviewed_at' (optional)}
+        for bulk submission, e.g. from an offline client; flushed every
+        batch_size reviews and committed once, so either all reviews are
+        recorded or none. Returns the session, or the list of sessions.
+        """
+        if reviews is None:
+            return self.record_review(user_id, reviews=[
+                {'sentence_id': sentence_id, 'input': input_data, 'score': score}
+            ])[0]
+
+        now = datetime.utcnow()
+        reviews = sorted(
+            ({**review, 'reviewed_at': self._review_time(review.get('reviewed_at'), now)} for review in reviews),
+            key=lambda review: review['reviewed_at']
+        )
+        sentence_ids = {review['sentence_id'] for review in reviews}
+        sentences = {
+            sentence.id: sentence for sentence in
+            Sentences.query.filter(Sentences.id.in_(sentence_ids), Sentences.user_id == user_id)
+        }
+        missing = sentence_ids - sentences.keys()
+        if missing:
+            raise ValueError(f"Sentence not found: {sorted(missing)}")
+
+        self._ensure_stats(user_id)
+        stats_row = self.db.session.get(User_Stats, user_id)
+        # reviews older than the last review day invalidate the incremental streak
+        rebuild = bool(stats_row.last_review_date and reviews[0]['reviewed_at'].date() < stats_row.last_review_date)
+
+        sessions = []
+        for start in range(0, len(reviews), batch_size):
+            for review in reviews[start:start + batch_size]:
+                sentence = sentences[review['sentence_id']]
+                sessions.append(self._add_session(
+                    user_id, sentence.id, review.get('input'), review['score'], review['reviewed_at']
+                ))
+                # a card reviewed online since then keeps its newer progress
+                if review['score'] is not None and not (sentence.last_review and sentence.last_review > review['reviewed_at']):
+                    self._apply_progress(
+                        sentence, review['score'], review['score'] >= config.REVIEW_SUCCESS_THRESHOLD, review['reviewed_at']
+                    )
+            self.db.session.flush()
+        if rebuild:
+            self._rebuild_learning_stats(user_id)
+        self._commit()
+        for sentence_id in sentence_ids:
+            get_review_queue().discard(user_id, sentence_id)
+        return sessions
+
     def get_sessions_for_user(self, user_id):
         return Sessions.query.filter_by(user_id=user_id).all()
 
@@ -153,34 +574,231 @@ class DataManager:
     def get_session_by_id(self, session_id):
         return Sessions.query.get(session_id)
 
+    SESSION_FIELDS = ('id', 'user_id', 'sentence_id', 'input', 'score', 'created_at')
+
+    def iter_user_export(self, user_id, batch_size=1000):
+        """
+        Yields the user's full learning history as dicts tagged with 'type'
+        (user, language, sentence, session, translation). Sentences and sessions are read
+        with server-side cursors in batches of batch_size, so memory stays
+        flat no matter how long the history is.
+        """
+        user = self.get_user_by_id(user_id)
+        if not user:
+            raise ValueError("User not found")
+
+        yield {
+            'type': 'user',
+            'id': user.id,
+            'username': user.username,
+            'native_language': user.native_language,
+            'created_at': user.created_at.isoformat() if user.created_at else None
+        }
+        for lang in self.get_user_languages(user_id):
+            yield {'type': 'language', 'language_code': lang.language_code}
+
+        exports = (
+            ('sentence', Sentences, self.SENTENCE_FIELDS),
+            ('session', Sessions, self.SESSION_FIELDS),
+        )
+        for row_type, model, fields in exports:
+            query = (
+                select(*[getattr(model, f) for f in fields])
+                .where(model.user_id == user_id)
+                .order_by(model.id)
+                .execution_options(yield_per=batch_size)
+            )
+            for values in self.db.session.execute(query):
+                yield {'type': row_type, **self._row_to_dict(fields, values)}
+
+        translation_fields = ('id', 'sentence_id', 'target_language', 'translated_text', 'created_at')
+        query = (
+            select(*[getattr(Translations, f) for f in translation_fields])
+            .join(Sentences, Sentences.id == Translations.sentence_id)
+            .where(Sentences.user_id == user_id)
+            .order_by(Translations.id)
+            .execution_options(yield_per=batch_size)
+        )
+        for values in self.db.session.execute(query):
+            yield {'type': 'translation', **self._row_to_dict(translation_fields, values)}
+
+    @staticmethod
+    def _review_time(reviewed_at, now):
+        # client timestamps: naive UTC like the rest of the database, never in the future
+        if reviewed_at is None:
+            return now
+        if reviewed_at.tzinfo is not None:
+            reviewed_at = reviewed_at.astimezone(timezone.utc).replace(tzinfo=None)
+        return min(reviewed_at, now)
+
+    # Scoring Jobs
+    # Status lives in the database, so any server worker can answer the poll
+    def create_scoring_job(self, job_id, user_id, sentence_id):
+        self.db.session.add(Scoring_Jobs(id=job_id, user_id=user_id, sentence_id=sentence_id, status='queued'))
+        self._commit()
+
+    def update_scoring_job(self, job_id, **fields):
+        Scoring_Jobs.query.filter_by(id=job_id).update(fields)
+        self._commit()
+
+    def get_scoring_job(self, job_id):
+        job = self.db.session.get(Scoring_Jobs, job_id)
+        if not job:
+            return None
+        return {
+            'job_id': job.id,
+            'status': job.status,
+            'user_id': job.user_id,
+            'sentence_id': job.sentence_id,
+            'score': job.score,
+            'session_id': job.session_id,
+            'error': job.error,
+            'created_at': job.created_at.isoformat() if job.created_at else None,
+            'finished_at': job.finished_at.isoformat() if job.finished_at else None,
+        }
+
+    def purge_scoring_jobs(self, older_than):
+        # also removes jobs a crashed worker left queued/running
+        Scoring_Jobs.query.filter(Scoring_Jobs.created_at < older_than).delete()
+        self._commit()
+
     # Sentence Progress Management
     def update_sentence_progress(self, sentence_id, new_score, is_success):
         sentence = Sentences.query.get(sentence_id)
         if not sentence:
             raise ValueError("Sentence not found")
             
+        self._ensure_stats(sentence.user_id)
+        self._apply_progress(sentence, new_score, is_success, datetime.utcnow())
+        self._commit()
+        get_review_queue().discard(sentence.user_id, sentence_id)
+        return sentence
+
+    def _apply_progress(self, sentence, new_score, is_success, now):
+        score_delta = new_score - (sentence.score or 0.0)
+        self._bump_stats(sentence.user_id, sentence_score_sum=score_delta)
+        self._bump_bucket(sentence.user_id, 'category', sentence.category, score_sum=score_delta)
+
+        scheduler = get_scheduler()
+        card = {field: getattr(sentence, field) for field in scheduler.state_fields}
+        card['last_review'] = sentence.last_review
+        card['next_review'] = sentence.next_review
+        state = scheduler.review(card, new_score, is_success, now)
+        for field in scheduler.state_fields:
+            setattr(sentence, field, state[field])
+
         sentence.score = new_score
         sentence.review_count += 1
-        sentence.last_review = datetime.utcnow()
-        
-        # Simple Anki algorithm
-        if is_success:
-            # Increase interval based on review count
-            interval_days = max(1, sentence.review_count * 2)
-        else:
-            # Reset to 1 day for failed reviews
-            interval_days = 1
-            
-        sentence.next_review = datetime.utcnow() + timedelta(days=interval_days)
+        sentence.last_review = now
+        sentence.next_review = now + timedelta(days=state['due_in_days'])
+
+    def reschedule_deck(self, user_id=None, scheduler=None, chunk_size=5000):
+        """
+        Recomputes next_review of every reviewed card (of one user or of all
+        users) from the stored scheduler state, e.g. after changing scheduler
+        parameters. Works in id-ordered chunks: one SELECT of plain columns,
+        one NumPy pass and one executemany UPDATE per chunk.
+        """
+        scheduler = scheduler or get_scheduler()
+        columns = [Sentences.id, Sentences.last_review, Sentences.next_review] + [
+            getattr(Sentences, f) for f in scheduler.state_fields
+        ]
+        updated = 0
+        last_id = 0
+
+        while True:
+            query = select(*columns).where(Sentences.id > last_id, Sentences.last_review.isnot(None))
+            if user_id is not None:
+                query = query.where(Sentences.user_id == user_id)
+            rows = self.db.session.execute(query.order_by(Sentences.id).limit(chunk_size)).all()
+            if not rows:
+                break
+
+            values = list(zip(*rows))
+            ids = values[0]
+            last_review = np.array(values[1], dtype='datetime64[us]')
+            state = {
+                field: np.array(column, dtype=float)  # None -> nan
+                for field, column in zip(scheduler.state_fields, values[3:])
+            }
+            # seeds cards without a stored interval (reviewed before interval_days existed)
+            state['last_review'] = last_review
+            state['next_review'] = np.array(values[2], dtype='datetime64[us]')  # None -> NaT
+            seconds = np.rint(scheduler.intervals(state) * 86400).astype('int64')
+            next_review = (last_review + seconds.astype('timedelta64[s]')).tolist()
+
+            self.db.session.execute(
+                update(Sentences),
+                [{'id': sentence_id, 'next_review': due} for sentence_id, due in zip(ids, next_review)]
+            )
+            updated += len(rows)
+            last_id = ids[-1]
+
         self._commit()
-        return sentence
+        get_review_queue().invalidate(user_id)
+        return updated
 
     def get_due_sentences(self, user_id):
         now = datetime.utcnow()
         return Sentences.query.filter(
             and_(Sentences.user_id == user_id, 
                  Sentences.next_review <= now)
-        ).all()
+        ).order_by(Sentences.next_review.asc()).all()
+
+    def get_next_due(self, user_id, limit=1, category=None):
+        # most overdue first; served by ix_sentences_user_(category_)next_review
+        query = Sentences.query.filter(
+            Sentences.user_id == user_id,
+            Sentences.next_review <= datetime.utcnow()
+        )
+        if category:
+            query = query.filter(Sentences.category == category)
+        return query.order_by(Sentences.next_review.asc()).limit(limit).all()
+
+    def get_review_cards(self, user_id, limit, exclude_ids=()):
+        """
+        Next due cards as ReviewCard snapshots for the review queue, with the
+        user's target languages and the stored reference translations.
+        """
+        profile = self.get_user_profile(user_id)
+        if not profile or limit <= 0:
+            return []
+        query = (
+            select(
+                Sentences.id, Sentences.original_text, Sentences.language_code, Sentences.category,
+                Sentences.score, Sentences.review_count, Sentences.next_review
+            )
+            .where(Sentences.user_id == user_id, Sentences.next_review <= datetime.utcnow())
+            .order_by(Sentences.next_review.asc())
+            .limit(limit)
+        )
+        if exclude_ids:
+            query = query.where(Sentences.id.notin_(exclude_ids))
+        rows = self.db.session.execute(query).all()
+
+        translations = {}
+        if rows:
+            for sentence_id, target_language, translated_text in self.db.session.execute(
+                select(Translations.sentence_id, Translations.target_language, Translations.translated_text)
+                .where(Translations.sentence_id.in_([row.id for row in rows]))
+            ):
+                translations.setdefault(sentence_id, {})[target_language] = translated_text
+
+        return [
+            ReviewCard(
+                id=row.id,
+                user_id=user_id,
+                original_text=row.original_text,
+                language_code=row.language_code,
+                category=row.category,
+                score=row.score,
+                review_count=row.review_count,
+                next_review=row.next_review,
+                target_languages=profile.target_languages,
+                translations=translations.get(row.id, {})
+            )
+            for row in rows
+        ]
 
     def get_sentence_by_id(self, sentence_id):
         return Sentences.query.get(sentence_id)
@@ -190,17 +808,193 @@ class DataManager:
         if sentence:
             sentence.original_text = new_text
             self._commit()
+            get_review_queue().discard(sentence.user_id, sentence_id)
             return sentence
         return None
 
     def get_learning_stats(self, user_id):
-        total_sentences = Sentences.query.filter_by(user_id=user_id).count()
-        total_sessions = Sessions.query.filter_by(user_id=user_id).count()
-        avg_score = db.session.query(func.avg(Sentences.score)).filter_by(user_id=user_id).scalar() or 0
-        
+        stats_row = self.db.session.get(User_Stats, user_id)
+        if stats_row is None:
+            if not self.get_user_by_id(user_id):
+                raise ValueError("User not found")
+            stats_row = self._rebuild_learning_stats(user_id)
+            self._commit()
+        buckets = User_Stats_Buckets.query.filter_by(user_id=user_id).all()
+
+        # index range count on ix_sentences_user_next_review
+        end_of_today = datetime.combine(datetime.utcnow().date() + timedelta(days=1), datetime.min.time())
+        due_today = Sentences.query.filter(
+            Sentences.user_id == user_id,
+            Sentences.next_review < end_of_today
+        ).count()
+
+        # streak is broken if the last review was before yesterday
+        today = datetime.utcnow().date()
+        current_streak = stats_row.current_streak
+        if not stats_row.last_review_date or stats_row.last_review_date < today - timedelta(days=1):
+            current_streak = 0
+
         stats = {
-            'total_sentences': total_sentences,
-            'total_sessions': total_sessions,
-            'avg_score': float(avg_score)
+            'total_sentences': stats_row.total_sentences,
+            'total_sessions': stats_row.total_sessions,
+            'avg_score': stats_row.sentence_score_sum / stats_row.total_sentences if stats_row.total_sentences else 0.0,
+            'avg_session_score': stats_row.session_score_sum / stats_row.scored_sessions if stats_row.scored_sessions else 0.0,
+            'due_today': due_today,
+            'current_streak': current_streak,
+            'longest_streak': stats_row.longest_streak,
+            'last_review_date': stats_row.last_review_date.isoformat() if stats_row.last_review_date else None,
+            'categories': {},
+            'languages': {}
         }
-        return stats
\ No newline at end of file
+        for bucket in buckets:
+            if bucket.count <= 0:
+                continue
+            group = 'categories' if bucket.kind == 'category' else 'languages'
+            stats[group][bucket.key or 'uncategorized'] = {
+                'count': bucket.count,
+                'avg_score': bucket.score_sum / bucket.count
+            }
+        return stats
+
+    # Learning Stats Aggregates
+    # Writers call _ensure_stats before changing anything and the _bump helpers
+    # before their _commit, so the aggregates change in the same transaction.
+    def _ensure_stats(self, user_id):
+        if self.db.session.get(User_Stats, user_id) is None:
+            # users from before the aggregates existed: build once from their rows
+            self._rebuild_learning_stats(user_id)
+
+    def _bump_stats(self, user_id, **deltas):
+        # relative UPDATE, so concurrent writers don't overwrite each other
+        self.db.session.execute(
+            update(User_Stats)
+            .where(User_Stats.user_id == user_id)
+            .values({name: getattr(User_Stats, name) + delta for name, delta in deltas.items()})
+        )
+
+    def _bump_bucket(self, user_id, kind, key, count=0, score_sum=0.0):
+        key = key or ''
+        result = self.db.session.execute(
+            update(User_Stats_Buckets)
+            .where(
+                User_Stats_Buckets.user_id == user_id,
+                User_Stats_Buckets.kind == kind,
+                User_Stats_Buckets.key == key
+            )
+            .values(
+                count=User_Stats_Buckets.count + count,
+                score_sum=User_Stats_Buckets.score_sum + score_sum
+            )
+        )
+        if result.rowcount == 0 and count > 0:
+            self.db.session.add(User_Stats_Buckets(
+                user_id=user_id, kind=kind, key=key, count=count, score_sum=score_sum
+            ))
+
+    @staticmethod
+    def _session_languages(input_data):
+        translations = (input_data or {}).get('translations') if isinstance(input_data, dict) else None
+        if isinstance(translations, dict):
+            return list(translations.keys())
+        if isinstance(translations, list):
+            return [code for entry in translations if isinstance(entry, dict) for code in entry]
+        return []
+
+    def _record_session(self, user_id, input_data, score, review_date):
+        scored = score is not None
+        self._bump_stats(
+            user_id,
+            total_sessions=1,
+            scored_sessions=1 if scored else 0,
+            session_score_sum=score if scored else 0.0
+        )
+
+        if scored:
+            for language_code in self._session_languages(input_data):
+                self._bump_bucket(user_id, 'language', language_code, count=1, score_sum=score)
+
+        stats_row = self.db.session.get(User_Stats, user_id, populate_existing=True)
+        if stats_row.last_review_date == review_date:
+            return
+        if stats_row.last_review_date == review_date - timedelta(days=1):
+            stats_row.current_streak += 1
+        else:
+            stats_row.current_streak = 1
+        stats_row.longest_streak = max(stats_row.longest_streak, stats_row.current_streak)
+        stats_row.last_review_date = review_date
+
+    def _unrecord_sessions(self, user_id, condition):
+        # returns the number of sessions taken out of the aggregates
+        removed = self.db.session.query(Sessions.score, Sessions.input).filter(condition).all()
+        if not removed:
+            return 0
+        scored = [(score, input_data) for score, input_data in removed if score is not None]
+        self._bump_stats(
+            user_id,
+            total_sessions=-len(removed),
+            scored_sessions=-len(scored),
+            session_score_sum=-sum(score for score, _ in scored)
+        )
+        for score, input_data in scored:
+            for language_code in self._session_languages(input_data):
+                self._bump_bucket(user_id, 'language', language_code, count=-1, score_sum=-score)
+        return len(removed)
+
+    def _rebuild_learning_stats(self, user_id):
+        self.db.session.flush()
+        User_Stats_Buckets.query.filter_by(user_id=user_id).delete()
+
+        sentence_count, sentence_score_sum = self.db.session.query(
+            func.count(Sentences.id), func.coalesce(func.sum(Sentences.score), 0.0)
+        ).filter(Sentences.user_id == user_id).one()
+        session_count, scored_count, session_score_sum = self.db.session.query(
+            func.count(Sessions.id), func.count(Sessions.score), func.coalesce(func.sum(Sessions.score), 0.0)
+        ).filter(Sessions.user_id == user_id).one()
+
+        stats_row = self.db.session.get(User_Stats, user_id) or User_Stats(user_id=user_id)
+        stats_row.total_sentences = sentence_count
+        stats_row.sentence_score_sum = float(sentence_score_sum)
+        stats_row.total_sessions = session_count
+        stats_row.scored_sessions = scored_count
+        stats_row.session_score_sum = float(session_score_sum)
+        self.db.session.add(stats_row)
+
+        for category, count, score_sum in self.db.session.query(
+            Sentences.category, func.count(Sentences.id), func.coalesce(func.sum(Sentences.score), 0.0)
+        ).filter(Sentences.user_id == user_id).group_by(Sentences.category):
+            self.db.session.add(User_Stats_Buckets(
+                user_id=user_id, kind='category', key=category or '', count=count, score_sum=float(score_sum)
+            ))
+
+        languages = {}
+        for score, input_data in self.db.session.query(Sessions.score, Sessions.input).filter(
+            Sessions.user_id == user_id, Sessions.score.isnot(None)
+        ).yield_per(1000):
+            for language_code in self._session_languages(input_data):
+                count, score_sum = languages.get(language_code, (0, 0.0))
+                languages[language_code] = (count + 1, score_sum + score)
+        for language_code, (count, score_sum) in languages.items():
+            self.db.session.add(User_Stats_Buckets(
+                user_id=user_id, kind='language', key=language_code, count=count, score_sum=score_sum
+            ))
+
+        self._rebuild_streak(user_id, stats_row)
+        self.db.session.flush()
+        return stats_row
+
+    def _rebuild_streak(self, user_id, stats_row):
+        # streak from the distinct review days, newest first
+        review_days = [
+            day if isinstance(day, date) else date.fromisoformat(str(day))
+            for (day,) in self.db.session.query(func.date(Sessions.created_at))
+            .filter(Sessions.user_id == user_id).distinct()
+            .order_by(func.date(Sessions.created_at).desc())
+        ]
+        streak, longest, previous = 0, 0, None
+        for day in reversed(review_days):
+            streak = streak + 1 if previous and day == previous + timedelta(days=1) else 1
+            longest = max(longest, streak)
+            previous = day
+        stats_row.last_review_date = review_days[0] if review_days else None
+        stats_row.current_streak = streak
+        stats_row.longest_streak = longest
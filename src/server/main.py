@@ -10,6 +10,7 @@ project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..
 sys.path.insert(0, project_root)
 
 from app import create_app
+from src.server.core import config
 
 def main():
     """Main application entry point"""
@@ -18,13 +19,14 @@ def main():
     
     # staaart
     print("🚀 Starting N-LanguagesAI Server...")
-    print(f"📊 API Documentation available at: http://localhost:5002/apidocs")
-    print(f"🌍 Server running on: http://localhost:5002")
+    print(f"📊 API Documentation available at: http://localhost:{config.SERVER_PORT}/apidocs")
+    print(f"🌍 Server running on: http://localhost:{config.SERVER_PORT}")
+    print("   (development server - use `python -m src.server.wsgi` in production)")
     print("⏹️  Press CTRL+C to stop the server")
     
     app.run(
-        host="0.0.0.0", 
-        port=5002, 
+        host=config.SERVER_HOST,
+        port=config.SERVER_PORT,
         debug=True,
         use_reloader=True
     )
@@ -3,6 +3,11 @@ from .api import (
     SentenceCreateRequest,
     SessionCreateRequest,
     LearningAttemptRequest,
+    EvaluateItemRequest,
+    EvaluateBatchRequest,
+    EvaluateAsyncRequest,
+    ReviewItemRequest,
+    ReviewBatchRequest,
     UserResponse,
     UserCreateResponse,
     SentenceResponse,
@@ -3,11 +3,6 @@ from pydantic import BaseModel, Field, validator
 from typing import Optional, List
 from datetime import datetime
 
-from flask import current_app, request, jsonify
-from src.server.api.llm_adapter import LLMAdapter
-
-
-
 
 # Request Models (Input)
 class UserCreateRequest(BaseModel):
@@ -28,6 +23,29 @@ class LearningAttemptRequest(BaseModel):
     sentence_id: int = Field(..., gt=0, example=1)
     user_answer: str = Field(..., min_length=1, example="I learn German")
 
+class EvaluateItemRequest(BaseModel):
+    to_translate: str = Field(..., min_length=1, example="Ich fahre zur Arbeit")
+    translations: dict = Field(..., example={"translations": [{"it": "Vado al lavoro"}]})
+    references: Optional[dict] = Field(None, example={"it": "Vado al lavoro"})
+
+class EvaluateAsyncRequest(BaseModel):
+    user_id: int = Field(..., gt=0, example=1)
+    sentence_id: int = Field(..., gt=0, example=1)
+    translations: dict = Field(..., example={"translations": [{"it": "Vado al lavoro"}]})
+    references: Optional[dict] = Field(None, example={"it": "Vado al lavoro"})
+
+class EvaluateBatchRequest(BaseModel):
+    items: List[EvaluateItemRequest] = Field(..., min_length=1, max_length=200)
+
+class ReviewItemRequest(BaseModel):
+    sentence_id: int = Field(..., gt=0, example=1)
+    input: Optional[dict] = Field(None, example={"translations": {"it": "Vado al lavoro"}})
+    score: float = Field(..., ge=0.0, le=1.0, example=0.8)
+    reviewed_at: Optional[datetime] = Field(None, example="2024-01-01T10:00:00")
+
+class ReviewBatchRequest(BaseModel):
+    reviews: List[ReviewItemRequest] = Field(..., min_length=1, max_length=5000)
+
 # Response Models (Output)
 class UserResponse(BaseModel):
     id: int
@@ -10,6 +10,7 @@ class User(db.Model):
     username = db.Column(db.String(100), unique=True, nullable=False)
     native_language = db.Column(db.String(5), nullable=False)
     created_at = db.Column(db.Date)
+    deleted_at = db.Column(db.DateTime, nullable=True)  # soft delete, purged later
 
 
 
@@ -17,16 +18,23 @@ class User_Languages(db.Model):
     __tablename__ = 'user_languages'
 
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
     language_code = db.Column(db.String(5), nullable=False)
     created_at = db.Column(db.Date)
 
 
 class Sentences(db.Model):
     __tablename__ = 'sentences'
+    __table_args__ = (
+        # due-card lookups: WHERE user_id = ? [AND category = ?] AND next_review <= ? ORDER BY next_review
+        db.Index('ix_sentences_user_next_review', 'user_id', 'next_review'),
+        db.Index('ix_sentences_user_category_next_review', 'user_id', 'category', 'next_review'),
+        # keyset pagination: WHERE user_id = ? AND id > ? ORDER BY id
+        db.Index('ix_sentences_user_id', 'user_id', 'id'),
+    )
 
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
     original_text = db.Column(db.String(200), nullable=False)
     language_code = db.Column(db.String(5), nullable=False)
     category = db.Column(db.String(50))
@@ -35,17 +43,86 @@ class Sentences(db.Model):
     next_review = db.Column(db.DateTime, nullable=True)
     review_count = db.Column(db.Integer, default=0)
     created_at = db.Column(db.Date)
+    # scheduler state (SM-2: ease_factor/interval_days, FSRS: stability/difficulty)
+    ease_factor = db.Column(db.Float, nullable=True)
+    interval_days = db.Column(db.Float, nullable=True)
+    stability = db.Column(db.Float, nullable=True)
+    difficulty = db.Column(db.Float, nullable=True)
 
 
 class Sessions(db.Model):
     __tablename__ = 'sessions'
+    __table_args__ = (
+        db.Index('ix_sessions_user_created_at', 'user_id', 'created_at'),
+        db.Index('ix_sessions_sentence_id', 'sentence_id'),
+    )
 
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
-    sentence_id = db.Column(db.Integer, db.ForeignKey('sentences.id'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
+    sentence_id = db.Column(db.Integer, db.ForeignKey('sentences.id', ondelete='CASCADE'), nullable=False)
     input = db.Column(db.JSON, nullable=True)
     score = db.Column(db.Float, nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
 
 
+class User_Stats(db.Model):
+    # incrementally maintained learning stats, one row per user
+    __tablename__ = 'user_stats'
+
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), primary_key=True)
+    total_sentences = db.Column(db.Integer, nullable=False, default=0)
+    sentence_score_sum = db.Column(db.Float, nullable=False, default=0.0)
+    total_sessions = db.Column(db.Integer, nullable=False, default=0)
+    scored_sessions = db.Column(db.Integer, nullable=False, default=0)
+    session_score_sum = db.Column(db.Float, nullable=False, default=0.0)
+    last_review_date = db.Column(db.Date, nullable=True)
+    current_streak = db.Column(db.Integer, nullable=False, default=0)
+    longest_streak = db.Column(db.Integer, nullable=False, default=0)
+
+
+class User_Stats_Buckets(db.Model):
+    # per-category (sentence scores) and per-language (session scores) sums
+    __tablename__ = 'user_stats_buckets'
+
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), primary_key=True)
+    kind = db.Column(db.String(10), primary_key=True)  # 'category' | 'language'
+    key = db.Column(db.String(50), primary_key=True)
+    count = db.Column(db.Integer, nullable=False, default=0)
+    score_sum = db.Column(db.Float, nullable=False, default=0.0)
+
+
+class Translations(db.Model):
+    # stored AI reference translation per (sentence, target language)
+    __tablename__ = 'translations'
+    __table_args__ = (
+        db.UniqueConstraint('sentence_id', 'target_language', name='uq_translations_sentence_language'),
+        # cross-user dedup: same source text -> same translation
+        db.Index('ix_translations_source_hash_language', 'source_hash', 'target_language'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    sentence_id = db.Column(db.Integer, db.ForeignKey('sentences.id', ondelete='CASCADE'), nullable=False)
+    target_language = db.Column(db.String(5), nullable=False)
+    translated_text = db.Column(db.String(400), nullable=False)
+    source_hash = db.Column(db.String(64), nullable=False)
+    model = db.Column(db.String(100), nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+
+class Scoring_Jobs(db.Model):
+    # status of async scoring jobs, readable from every server worker
+    __tablename__ = 'scoring_jobs'
+    __table_args__ = (
+        db.Index('ix_scoring_jobs_created_at', 'created_at'),
+    )
+
+    id = db.Column(db.String(32), primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
+    sentence_id = db.Column(db.Integer, nullable=False)
+    status = db.Column(db.String(10), nullable=False, default='queued')  # queued | running | done | failed
+    score = db.Column(db.Float, nullable=True)
+    session_id = db.Column(db.Integer, nullable=True)
+    error = db.Column(db.String(500), nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    finished_at = db.Column(db.DateTime, nullable=True)
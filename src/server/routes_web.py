@@ -1,4 +1,4 @@
-from flask import Blueprint, render_template, request, redirect, url_for, current_app
+from flask import Blueprint, render_template, request, redirect, url_for, current_app, abort
 from src.server.extensions import db
 from src.server.models.data_models import User, User_Languages, Sentences, Sessions
 
@@ -65,39 +65,36 @@ def create_user():
 
 @web_bp.route("/dashboard/<int:user_id>")
 def dashboard(user_id):
-    user = User.query.get_or_404(user_id)
+    user = current_app.manager.get_user_profile(user_id)
+    if not user:
+        abort(404)
     return render_template("dashboard.html", user_id=user.id, username=user.username)
 
 
 @web_bp.route("/add_sentence/<int:user_id>", methods=["GET", "POST"])
 def add_sentence(user_id):
-    user = User.query.get_or_404(user_id)
-    target_languages = User_Languages.query.filter_by(user_id=user_id).all()
+    user = current_app.manager.get_user_profile(user_id)
+    if not user:
+        abort(404)
+    target_languages = user.target_languages
 
     if request.method == "POST":
         original_text = request.form["original_text"]
 
-        sentence = Sentences(
-            user_id=user.id,
-            original_text=original_text,
-            language_code=user.native_language
-        )
-        db.session.add(sentence)
-        db.session.commit()
+        sentence = current_app.manager.add_sentence_with_translations(user.id, original_text)
 
         # Create session with translations
         session_input = {}
-        for lang in target_languages:
-            translated_text = request.form.get(f"translation_{lang.language_code}")
+        for language_code in target_languages:
+            translated_text = request.form.get(f"translation_{language_code}")
             if translated_text:
                 if 'translations' not in session_input:
                     session_input['translations'] = {}
-                session_input['translations'][lang.language_code] = translated_text
+                session_input['translations'][language_code] = translated_text
         
         if session_input:
-            manager.create_session(user_id, sentence.id, session_input)
+            current_app.manager.create_session(user_id, sentence.id, session_input)
 
-        db.session.commit()
         return redirect(url_for("ui.dashboard", user_id=user.id))
 
     return render_template("get_sentences.html", user_id=user.id, target_languages=target_languages)
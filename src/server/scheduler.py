@@ -0,0 +1,175 @@
+import math
+
+import numpy as np
+
+from src.server.core import config
+
+
+class Scheduler:
+    """
+    Interface for spaced-repetition algorithms.
+
+    review() grades a single card after an answer and returns its new state;
+    intervals() recomputes the intervals of many cards at once from their
+    stored state (NumPy arrays), used when the parameters change.
+    """
+
+    name = None
+    # Sentences columns that hold this algorithm's per-card state
+    state_fields = ()
+
+    def __init__(self, max_interval_days):
+        self.max_interval_days = max_interval_days
+
+    def review(self, card: dict, score: float, is_success: bool, now) -> dict:
+        """
+        card: current state (state_fields + 'last_review', 'next_review'), score: 0-1.
+        Returns the new state plus 'due_in_days'.
+        """
+        raise NotImplementedError
+
+    def intervals(self, state: dict) -> np.ndarray:
+        """
+        state: NumPy arrays of state_fields, optionally 'last_review' and
+        'next_review' (datetime64) to seed cards without a stored interval.
+        """
+        raise NotImplementedError
+
+    def _clip(self, days):
+        return np.clip(days, 1, self.max_interval_days)
+
+    @staticmethod
+    def _card_interval(card):
+        # cards reviewed before interval_days existed: the scheduled gap is their interval
+        interval = card.get('interval_days')
+        last_review, next_review = card.get('last_review'), card.get('next_review')
+        if interval is None and last_review and next_review and next_review > last_review:
+            interval = (next_review - last_review).total_seconds() / 86400
+        return interval
+
+    @staticmethod
+    def _stored_intervals(state):
+        # vectorized _card_interval
+        interval = state['interval_days']
+        if 'last_review' in state and 'next_review' in state:
+            scheduled = (state['next_review'] - state['last_review']) / np.timedelta64(1, 'D')
+            scheduled = np.where(scheduled > 0, scheduled, np.nan)
+            interval = np.where(np.isnan(interval), scheduled, interval)
+        return interval
+
+
+class SM2Scheduler(Scheduler):
+    """
+    SuperMemo-2. The score is mapped to a quality of 0-5; the repetition
+    count is derived from the stored interval (none -> 1 day, 1 -> 6 days,
+    afterwards interval * ease factor); cards without a stored interval use
+    the gap between their last and next review.
+    """
+
+    name = "sm2"
+    state_fields = ('ease_factor', 'interval_days')
+
+    def __init__(self, max_interval_days, interval_modifier=1.0, initial_ease=2.5):
+        super().__init__(max_interval_days)
+        self.interval_modifier = interval_modifier
+        self.initial_ease = initial_ease
+
+    def review(self, card, score, is_success, now):
+        quality = min(5, max(0, round(score * 5)))
+        quality = max(quality, 3) if is_success else min(quality, 2)
+
+        ease = card.get('ease_factor') or self.initial_ease
+        interval = self._card_interval(card)
+        if quality < 3 or not interval:
+            interval = 1.0
+        elif interval <= 1:
+            interval = 6.0
+        else:
+            # stored clipped too, otherwise it grows to inf over many reviews
+            interval = float(min(round(interval * ease), self.max_interval_days))
+        ease = max(1.3, ease + 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02))
+
+        state = {'ease_factor': ease, 'interval_days': interval}
+        state['due_in_days'] = float(self.intervals({k: np.array([v]) for k, v in state.items()})[0])
+        return state
+
+    def intervals(self, state):
+        days = self._stored_intervals(state) * self.interval_modifier
+        return self._clip(np.nan_to_num(days, nan=1.0))
+
+
+class FSRSScheduler(Scheduler):
+    """
+    FSRS (v4 formulas): per-card stability (days until recall drops to 90%)
+    and difficulty (1-10). The score is mapped to again/hard/good/easy.
+    """
+
+    name = "fsrs"
+    state_fields = ('stability', 'difficulty', 'interval_days')
+    DEFAULT_WEIGHTS = (
+        0.4, 0.6, 2.4, 5.8, 4.93, 0.94, 0.86, 0.01, 1.49,
+        0.14, 0.94, 2.18, 0.05, 0.34, 1.26, 0.29, 2.61
+    )
+
+    def __init__(self, max_interval_days, request_retention=0.9, weights=None):
+        super().__init__(max_interval_days)
+        self.request_retention = request_retention
+        self.w = tuple(weights or self.DEFAULT_WEIGHTS)
+
+    def _grade(self, score, is_success):
+        # 1 again, 2 hard, 3 good, 4 easy
+        if not is_success:
+            return 1
+        if score < 0.8:
+            return 2
+        return 3 if score < 0.95 else 4
+
+    def review(self, card, score, is_success, now):
+        w = self.w
+        grade = self._grade(score, is_success)
+        stability, difficulty = card.get('stability'), card.get('difficulty')
+
+        if stability is None or difficulty is None:
+            # first FSRS review of this card
+            stability = w[grade - 1]
+            difficulty = w[4] - (grade - 3) * w[5]
+        else:
+            last_review = card.get('last_review')
+            elapsed = max(0.0, (now - last_review).total_seconds() / 86400) if last_review else 0.0
+            retrievability = (1 + elapsed / (9 * stability)) ** -1
+            if grade == 1:
+                stability = (w[11] * difficulty ** -w[12] * ((stability + 1) ** w[13] - 1)
+                             * math.exp(w[14] * (1 - retrievability)))
+            else:
+                hard_penalty = w[15] if grade == 2 else 1.0
+                easy_bonus = w[16] if grade == 4 else 1.0
+                stability = stability * (1 + math.exp(w[8]) * (11 - difficulty) * stability ** -w[9]
+                                         * (math.exp(w[10] * (1 - retrievability)) - 1)
+                                         * hard_penalty * easy_bonus)
+            difficulty = difficulty - w[6] * (grade - 3)
+            # mean reversion towards the initial difficulty of "good"
+            difficulty = w[7] * w[4] + (1 - w[7]) * difficulty
+        difficulty = min(10.0, max(1.0, difficulty))
+
+        state = {'stability': stability, 'difficulty': difficulty}
+        state['interval_days'] = float(self.intervals({
+            'stability': np.array([stability]), 'interval_days': np.array([np.nan])
+        })[0])
+        state['due_in_days'] = state['interval_days']
+        return state
+
+    def intervals(self, state):
+        stability = state['stability']
+        days = np.round(9 * stability * (1 / self.request_retention - 1))
+        # cards without FSRS state (e.g. reviewed under SM-2) keep their interval
+        days = np.where(np.isnan(stability), self._stored_intervals(state), days)
+        return self._clip(np.nan_to_num(days, nan=1.0))
+
+
+def get_scheduler(name=None) -> Scheduler:
+    name = name or config.SCHEDULER_ALGORITHM
+    if name == SM2Scheduler.name:
+        return SM2Scheduler(config.SCHEDULER_MAX_INTERVAL_DAYS, interval_modifier=config.SM2_INTERVAL_MODIFIER)
+    if name == FSRSScheduler.name:
+        return FSRSScheduler(config.SCHEDULER_MAX_INTERVAL_DAYS, request_retention=config.FSRS_REQUEST_RETENTION)
+    raise ValueError(f"Unsupported scheduler: {name}")
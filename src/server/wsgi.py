@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Production entry point for the N-LanguagesAI application
+
+    python -m src.server.wsgi
+
+runs create_app() under gunicorn with SERVER_WORKERS processes of
+SERVER_THREADS threads each (settings in src/server/core/config.py).
+With SERVER_PRELOAD the app is built once in the master before fork;
+the local model is loaded lazily in each worker (llama.cpp's thread pool
+isn't fork-safe), with use_mmap the weights are still shared through the
+page cache.
+"""
+import os
+import sys
+
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from app import create_app, start_background_workers_for
+from src.server.core import config
+from src.server.extensions import db
+
+
+def load_app():
+    # built in load() and not at import time: the spawned llama.cpp pool
+    # processes (LLM_LOCAL_WORKERS > 0) re-import this module as __mp_main__
+    # and must not run create_app()/sync_schema again.
+    # Threads don't survive the fork, they are started per worker in post_worker_init
+    return create_app(start_background_workers=False)
+
+
+def post_worker_init(worker):
+    app = worker.wsgi
+    # pooled connections opened in the master must not be shared with the workers
+    with app.app_context():
+        db.engine.dispose(close=False)
+    start_background_workers_for(app)
+
+
+def options():
+    return {
+        'bind': f"{config.SERVER_HOST}:{config.SERVER_PORT}",
+        'workers': config.SERVER_WORKERS,
+        'threads': config.SERVER_THREADS,
+        'worker_class': 'gthread',
+        'keepalive': config.SERVER_KEEPALIVE_SECONDS,
+        'timeout': config.SERVER_TIMEOUT_SECONDS,
+        # SIGTERM: stop accepting, let running requests finish for this long
+        'graceful_timeout': config.SERVER_GRACEFUL_TIMEOUT_SECONDS,
+        'preload_app': config.SERVER_PRELOAD,
+        'post_worker_init': post_worker_init,
+    }
+
+
+def main():
+    """Production server entry point"""
+    from gunicorn.app.base import BaseApplication
+
+    class Server(BaseApplication):
+        def load_config(self):
+            for key, value in options().items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            return load_app()
+
+    print(f"🚀 Starting N-LanguagesAI Server ({config.SERVER_WORKERS} workers x {config.SERVER_THREADS} threads)...")
+    print(f"🌍 Server running on: http://{config.SERVER_HOST}:{config.SERVER_PORT}")
+    Server().run()
+
+
+if __name__ == '__main__':
+    main()